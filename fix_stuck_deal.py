@@ -18,6 +18,7 @@ from datetime import datetime, timezone, timedelta
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 try:
+    from sqlalchemy import select
     from database.models import get_db, Deal, Offer
 except ImportError:
     print("❌ Error: Could not import database models. Make sure you're in the project directory.")
@@ -36,9 +37,20 @@ def list_stuck_deals():
             'bitcoin_sent'
         ]
 
-        stuck_deals = db.query(Deal).filter(
+        # Only the columns printed below; rows are lightweight tuples, not Deal objects
+        stmt = select(
+            Deal.id,
+            Deal.status,
+            Deal.current_stage,
+            Deal.seller_id,
+            Deal.buyer_id,
+            Deal.amount_sats,
+            Deal.created_at,
+            Deal.stage_expires_at
+        ).where(
             Deal.status.in_(stuck_states)
-        ).all()
+        )
+        stuck_deals = db.execute(stmt).all()
 
         if not stuck_deals:
             print("✅ No stuck deals found")
@@ -68,28 +80,28 @@ def reset_deal_to_bitcoin_confirmed(deal_id):
     """Reset a deal to bitcoin_confirmed status so it can request Lightning invoice again"""
     db = get_db()
     try:
-        deal = db.query(Deal).filter(Deal.id == deal_id).first()
+        # Commits on success, rolls back automatically if anything raises
+        with db.begin():
+            deal = db.scalars(select(Deal).where(Deal.id == deal_id)).first()
 
-        if not deal:
-            print(f"❌ Deal #{deal_id} not found")
-            return False
+            if not deal:
+                print(f"❌ Deal #{deal_id} not found")
+                return False
 
-        print(f"📋 Current status of Deal #{deal_id}:")
-        print(f"  Status: {deal.status}")
-        print(f"  Stage: {deal.current_stage}")
-        print(f"  Seller ID: {deal.seller_id}")
-        print(f"  Buyer ID: {deal.buyer_id}")
-
-        # Reset to bitcoin_confirmed status
-        deal.status = 'bitcoin_confirmed'
-        deal.current_stage = 'invoice_required'
-        deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=2)
+            print(f"📋 Current status of Deal #{deal_id}:")
+            print(f"  Status: {deal.status}")
+            print(f"  Stage: {deal.current_stage}")
+            print(f"  Seller ID: {deal.seller_id}")
+            print(f"  Buyer ID: {deal.buyer_id}")
 
-        # Clear any previous Lightning invoice data
-        deal.lightning_invoice = None
-        deal.payment_hash = None
+            # Reset to bitcoin_confirmed status
+            deal.status = 'bitcoin_confirmed'
+            deal.current_stage = 'invoice_required'
+            deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=2)
 
-        db.commit()
+            # Clear any previous Lightning invoice data
+            deal.lightning_invoice = None
+            deal.payment_hash = None
 
         print(f"✅ Deal #{deal_id} reset to bitcoin_confirmed status")
         print(f"  New status: {deal.status}")
@@ -103,7 +115,6 @@ def reset_deal_to_bitcoin_confirmed(deal_id):
 
     except Exception as e:
         print(f"❌ Error resetting deal: {e}")
-        db.rollback()
         return False
     finally:
         db.close()
@@ -112,33 +123,39 @@ def cancel_deal_and_reactivate(deal_id):
     """Cancel a deal and reactivate the associated offer"""
     db = get_db()
     try:
-        deal = db.query(Deal).filter(Deal.id == deal_id).first()
-
-        if not deal:
-            print(f"❌ Deal #{deal_id} not found")
-            return False
-
-        print(f"📋 Cancelling Deal #{deal_id}:")
-        print(f"  Current status: {deal.status}")
-
-        # Cancel the deal
-        deal.status = 'cancelled'
-        deal.timeout_reason = 'Manual recovery action'
-
-        # Reactivate the offer if it exists
-        offer = db.query(Offer).filter(Offer.id == deal.offer_id).first()
-        if offer:
-            # Check if original 48-hour expiration time has passed
-            if offer.expires_at and datetime.now(timezone.utc) > offer.expires_at:
-                offer.status = 'expired'
-                print(f"  Associated offer #{offer.id} marked as expired (original 48h limit passed)")
-            else:
-                offer.status = 'active'
-                offer.taken_by = None
-                offer.taken_at = None
-                print(f"  Associated offer #{offer.id} reactivated")
-
-        db.commit()
+        # Commits on success, rolls back automatically if anything raises
+        with db.begin():
+            # Load the deal and its offer in a single query
+            row = db.execute(
+                select(Deal, Offer)
+                .outerjoin(Offer, Offer.id == Deal.offer_id)
+                .where(Deal.id == deal_id)
+            ).first()
+
+            if not row:
+                print(f"❌ Deal #{deal_id} not found")
+                return False
+
+            deal, offer = row
+
+            print(f"📋 Cancelling Deal #{deal_id}:")
+            print(f"  Current status: {deal.status}")
+
+            # Cancel the deal
+            deal.status = 'cancelled'
+            deal.timeout_reason = 'Manual recovery action'
+
+            # Reactivate the offer if it exists
+            if offer:
+                # Check if original 48-hour expiration time has passed
+                if offer.expires_at and datetime.now(timezone.utc) > offer.expires_at:
+                    offer.status = 'expired'
+                    print(f"  Associated offer #{offer.id} marked as expired (original 48h limit passed)")
+                else:
+                    offer.status = 'active'
+                    offer.taken_by = None
+                    offer.taken_at = None
+                    print(f"  Associated offer #{offer.id} reactivated")
 
         print(f"✅ Deal #{deal_id} cancelled successfully")
 
@@ -146,7 +163,6 @@ def cancel_deal_and_reactivate(deal_id):
 
     except Exception as e:
         print(f"❌ Error cancelling deal: {e}")
-        db.rollback()
         return False
     finally:
         db.close()
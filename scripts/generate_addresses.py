@@ -4,9 +4,20 @@ Generate Bitcoin testnet addresses for P2P Swap Bot escrow using mnemonic seed
 """
 
 from bitcoinlib.mnemonic import Mnemonic
-from bitcoinlib.wallets import Wallet
+from bitcoinlib.keys import HDKey
 import os
-import time
+
+# BIP84 testnet: m / purpose' / coin_type' / account' / change / index
+DERIVATION_PATH = "m/84'/1'/0'/0/{index}"
+
+# Escrow amounts (sats) and the .env key each address is stored under
+ADDRESS_LABELS = {
+    10000: 'BITCOIN_ADDRESS_10K',
+    50000: 'BITCOIN_ADDRESS_50K',
+    100000: 'BITCOIN_ADDRESS_100K',
+    500000: 'BITCOIN_ADDRESS_500K',
+    1000000: 'BITCOIN_ADDRESS_1M',
+}
 
 def generate_testnet_addresses():
     """Generate testnet addresses from mnemonic seed using BIP84 derivation"""
@@ -40,47 +51,35 @@ def generate_testnet_addresses():
     print("🚨 TESTNET ONLY - Never use on mainnet")
     print()
     
-    # Create wallet with unique name to avoid conflicts
-    wallet_name = f'p2pswap_testnet_{int(time.time())}'
-    
-    # Create new wallet
-    wallet = Wallet.create(
-        name=wallet_name,
-        keys=mnemonic,
+    # Derive directly from the seed - no wallet database needed
+    master_key = HDKey.from_seed(
+        mnemonic_obj.to_seed(mnemonic),
         network='testnet',
-        account_id=0,
         witness_type='segwit'  # Use native segwit (bech32)
     )
     
     # Generate addresses for different amounts
-    amounts = [10000, 50000, 100000, 500000, 1000000]
     addresses = {}
     
     print("📍 DERIVED ADDRESSES (BIP84 - Native SegWit):")
     print("=" * 70)
     
-    for i, amount in enumerate(amounts):
-        # Generate new key
-        key = wallet.new_key()
-        address = key.address
+    for i, (amount, key_name) in enumerate(ADDRESS_LABELS.items()):
+        # Derive key for this index
+        path = DERIVATION_PATH.format(index=i)
+        key = master_key.subkey_for_path(path)
+        address = key.address()
         
         # Store for .env file
-        if amount >= 1000000:
-            key_name = f"BITCOIN_ADDRESS_{amount//1000000}M"
-        elif amount >= 1000:
-            key_name = f"BITCOIN_ADDRESS_{amount//1000}K"
-        else:
-            key_name = f"BITCOIN_ADDRESS_{amount}"
-            
         addresses[key_name] = {
             'address': address,
-            'derivation_path': key.path,
+            'derivation_path': path,
             'amount': amount,
             'index': i
         }
         
         print(f"📍 {amount:,} sats: {address}")
-        print(f"   Path: {key.path}")
+        print(f"   Path: {path}")
         print()
     
     print("📝 ADD TO YOUR .env FILE:")
@@ -117,12 +116,6 @@ def generate_testnet_addresses():
     import datetime
     print(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
     
-    # Clean up wallet from memory (but addresses remain accessible via seed)
-    try:
-        Wallet.delete(wallet_name)
-    except:
-        pass
-    
     return addresses, mnemonic
 
 if __name__ == "__main__":
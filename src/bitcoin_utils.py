@@ -7,12 +7,32 @@ Optimizado para principiantes - Fácil de modificar y entender
 """
 
 import os
+import re
+import asyncio
 import requests
 import logging
-import time
+import random
+import threading
 import base64
 import binascii
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache_utils import TTLCache
+from lightning_utils import (
+    extract_payment_hash_from_invoice as lnd_extract,
+    check_lightning_payment_status as lnd_check
+)
+
+# orjson es opcional: si está instalado se usa para parsear las respuestas de la API
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -31,10 +51,125 @@ else:
     BLOCKSTREAM_API = "https://blockstream.info/api"
     MEMPOOL_API = "https://mempool.space/api"
 
+# Validación de direcciones - un patrón anclado por red (compilado una sola vez)
+# Segwit: versión q (v0) o p (v1/taproot) + datos bech32, 42-62 caracteres en total
+# Legacy/P2SH: prefijo de la red + base58, 26-35 caracteres en total
+_SEGWIT_DATA_RE = r'[qp][qpzry9x8gf2tvdw0s3jn54khce6mua7l]{38,58}'
+_BASE58_DATA_RE = r'[1-9A-HJ-NP-Za-km-z]{25,34}'
+TESTNET_ADDRESS_RE = re.compile(rf'^(?:(?i:(?:tb1|bc1){_SEGWIT_DATA_RE})|[2mn]{_BASE58_DATA_RE})$')
+MAINNET_ADDRESS_RE = re.compile(rf'^(?:(?i:bc1{_SEGWIT_DATA_RE})|[13]{_BASE58_DATA_RE})$')
+
 # Configuración de timeouts y reintentos
 API_TIMEOUT = 10        # Timeout para requests API (segundos)
 RETRY_ATTEMPTS = 3      # Número de reintentos para APIs
-MONITOR_INTERVAL = 30   # Intervalo de monitoreo (segundos)
+RETRY_BACKOFF_FACTOR = 0.3  # Backoff exponencial entre reintentos (0.3s, 0.6s, 1.2s)
+RETRY_JITTER = 0.3      # Jitter aleatorio máximo añadido a cada espera (segundos)
+MONITOR_INTERVAL = 30   # Intervalo de monitoreo inicial (segundos)
+MAX_MONITOR_INTERVAL = 300  # Intervalo máximo de monitoreo con backoff (segundos)
+
+# Pool de conexiones HTTP (keep-alive hacia Blockstream)
+# requests solo habla HTTP/1.1: cada request concurrente necesita su propia conexión,
+# así que el pool debe cubrir todos los hilos que consultan la API a la vez
+POOL_CONNECTIONS = 2    # Hosts distintos: Blockstream y mempool.space
+POOL_MAXSIZE = 32       # Conexiones reutilizables por host (monitores + handlers + API_WORKERS)
+API_WORKERS = 4         # Hilos para lanzar requests independientes en paralelo
+MAX_PARALLEL_UTXOS = 8  # Máximo de UTXOs candidatos consultados a la vez
+
+# Cache de respuestas API - la altura del tip solo cambia cada ~10 minutos
+TX_CACHE_TTL = 60           # Cache de transacciones (segundos)
+TX_CACHE_DEEP_TTL = 600     # Cache de transacciones con confirmaciones profundas
+TIP_CACHE_TTL = 30          # Cache de altura del último bloque (segundos)
+BALANCE_CACHE_TTL = 20      # Cache de balances consultados por el bot (segundos)
+CONFIRMATIONS_CACHE_TTL = 60  # Cache de confirmaciones por txid (válido mientras no cambie el tip)
+BLOCK_HEIGHT_CACHE_TTL = 1800  # Bloque de una tx confirmada (solo cambia con un reorg)
+DEEP_CONFIRMATIONS = 6      # Confirmaciones a partir de las cuales block_height no cambia
+
+# =============================================================================
+# CHECKSUMS DE DIRECCIONES (BECH32 / BASE58CHECK)
+# =============================================================================
+# Validación local del checksum: detecta errores de tipeo sin llamar a ninguna API
+
+BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+BECH32_VALUES = {char: value for value, char in enumerate(BECH32_CHARSET)}  # char -> 5 bits
+BECH32_RE = re.compile(r'^(bc|tb|bcrt)1[qpzry9x8gf2tvdw0s3jn54khce6mua7l]{6,87}$', re.IGNORECASE)
+BECH32_CONST = 1            # Checksum bech32 (witness v0, BIP173)
+BECH32M_CONST = 0x2bc830a3  # Checksum bech32m (witness v1+, BIP350)
+BECH32_GENERATOR = (0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3)
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+def _bech32_generator_table() -> tuple:
+    """XOR de los generadores para cada valor posible de los 5 bits altos del checksum"""
+    table = []
+    for top in range(32):
+        xor = 0
+        for i in range(5):
+            if (top >> i) & 1:
+                xor ^= BECH32_GENERATOR[i]
+        table.append(xor)
+    return tuple(table)
+
+BECH32_TABLE = _bech32_generator_table()  # top (5 bits) -> generadores combinados
+
+def _bech32_polymod(values) -> int:
+    """Polinomio BCH de bech32 sobre valores de 5 bits (un lookup por símbolo en vez de 5 ramas)"""
+    chk = 1
+    for value in values:
+        chk = ((chk & 0x1ffffff) << 5 ^ value) ^ BECH32_TABLE[chk >> 25]
+    return chk
+
+def _bech32_checksum_valid(address: str) -> bool:
+    """Verifica el checksum de una dirección segwit (bech32 o bech32m según la versión)"""
+    # Charset, hrp y longitud con un solo regex; mayúsculas y minúsculas mezcladas no son válidas
+    if BECH32_RE.match(address) is None or (address != address.lower() and address != address.upper()):
+        return False
+
+    address = address.lower()
+    separator = address.rfind('1')
+    hrp = address[:separator]
+    data = [BECH32_VALUES[char] for char in address[separator + 1:]]
+
+    expanded_hrp = [ord(char) >> 5 for char in hrp] + [0] + [ord(char) & 31 for char in hrp]
+    expected = BECH32_CONST if data[0] == 0 else BECH32M_CONST
+    return _bech32_polymod(expanded_hrp + data) == expected
+
+def _base58check_valid(address: str) -> bool:
+    """Verifica el checksum base58check (doble SHA256) de direcciones P2PKH/P2SH"""
+    number = 0
+    for char in address:
+        digit = BASE58_ALPHABET.find(char)
+        if digit < 0:
+            return False
+        number = number * 58 + digit
+
+    leading_zeros = len(address) - len(address.lstrip('1'))
+    raw = b'\x00' * leading_zeros + number.to_bytes((number.bit_length() + 7) // 8, 'big')
+    if len(raw) != 25:
+        return False
+
+    payload, checksum = raw[:-4], raw[-4:]
+    return hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] == checksum
+
+# =============================================================================
+# REINTENTOS HTTP Y PARSEO
+# =============================================================================
+
+def _parse_json(response: requests.Response):
+    """Parsea el cuerpo JSON de una respuesta (orjson si está disponible)"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+class JitteredRetry(Retry):
+    """
+    Retry de urllib3 con jitter aleatorio en el backoff
+    Evita que varios deals fallando a la vez reintenten exactamente al mismo tiempo
+    """
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return backoff + random.uniform(0, RETRY_JITTER)
 
 # =============================================================================
 # CLASE PRINCIPAL - MANEJO DE BITCOIN
@@ -48,7 +183,56 @@ class BitcoinManager:
     
     def __init__(self):
         self.network = NETWORK
+        self.address_re = TESTNET_ADDRESS_RE if self.network == 'testnet' else MAINNET_ADDRESS_RE
+        self.session = self._create_session()
+        self._tx_cache = TTLCache(maxsize=1024, ttl=TX_CACHE_TTL)
+        self._status_cache = TTLCache(maxsize=1024, ttl=TX_CACHE_TTL)
+        self._tip_cache = TTLCache(maxsize=1, ttl=TIP_CACHE_TTL)
+        self._confirmations_cache = TTLCache(maxsize=4096, ttl=CONFIRMATIONS_CACHE_TTL)  # txid -> (tip, confs)
+        self._block_height_cache = TTLCache(maxsize=4096, ttl=BLOCK_HEIGHT_CACHE_TTL)  # txid -> block_height
+        self._executor = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix='bitcoin-api')
+        self._tip_watcher = None
+        self._tip_watcher_lock = threading.Lock()
+        self._stop_event = threading.Event()
         logger.info(f"Bitcoin manager initialized for {self.network}")
+
+    def close(self):
+        """
+        Detiene el watcher del tip, el pool de hilos y cierra las conexiones HTTP
+        Llamar una sola vez al apagar el bot
+        """
+        self._stop_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+        logger.info("Bitcoin manager closed")
+
+    def _create_session(self) -> requests.Session:
+        """
+        Crea una sesión HTTP compartida con keep-alive y reintentos automáticos
+        Reutiliza conexiones TCP+TLS entre llamadas en lugar de abrir una por request
+        """
+        retry = JitteredRetry(
+            total=RETRY_ATTEMPTS,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Accept': 'application/json',
+            'User-Agent': 'p2pswapbot'
+        })
+        return session
         
     def validate_address(self, address: str) -> bool:
         """
@@ -56,18 +240,15 @@ class BitcoinManager:
         Soporta formatos testnet y mainnet
         """
         try:
-            if not address or len(address) < 26 or len(address) > 62:
+            # Prefijo, alfabeto y longitud con un solo match del patrón de la red
+            if not address or self.address_re.match(address) is None:
                 return False
-                
-            # Validación para testnet
-            if self.network == 'testnet':
-                valid_prefixes = ('tb1', 'bc1', '2', 'm', 'n')
-                return address.startswith(valid_prefixes)
-            else:
-                # Validación para mainnet
-                valid_prefixes = ('bc1', '1', '3')
-                return address.startswith(valid_prefixes)
-                
+
+            # Checksum: segwit usa bech32/bech32m, el resto base58check
+            if address[:3].lower() in ('bc1', 'tb1'):
+                return _bech32_checksum_valid(address)
+            return _base58check_valid(address)
+
         except Exception as e:
             logger.error(f"Error validating address {address}: {e}")
             return False
@@ -77,25 +258,21 @@ class BitcoinManager:
         Obtiene balance de dirección en satoshis usando Blockstream API
         """
         try:
-            for attempt in range(RETRY_ATTEMPTS):
-                try:
-                    response = requests.get(
-                        f"{BLOCKSTREAM_API}/address/{address}", 
-                        timeout=API_TIMEOUT
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        balance = data.get('chain_stats', {}).get('funded_txo_sum', 0)
-                        logger.info(f"Address {address} balance: {balance} sats")
-                        return balance
-                    else:
-                        logger.warning(f"API returned status {response.status_code} for address {address}")
-                        
-                except requests.RequestException as e:
-                    logger.warning(f"API attempt {attempt + 1} failed: {e}")
-                    if attempt < RETRY_ATTEMPTS - 1:
-                        time.sleep(2)  # Esperar antes de reintentar
-                        
+            # Los reintentos (con backoff) los maneja el adapter de la sesión
+            response = self.session.get(
+                f"{BLOCKSTREAM_API}/address/{address}",
+                timeout=API_TIMEOUT
+            )
+            if response.status_code == 200:
+                data = _parse_json(response)
+                balance = data.get('chain_stats', {}).get('funded_txo_sum', 0)
+                logger.info(f"Address {address} balance: {balance} sats")
+                return balance
+
+            logger.warning(f"API returned status {response.status_code} for address {address}")
+            return 0
+        except requests.RequestException as e:
+            logger.warning(f"Balance API request failed for {address}: {e}")
             return 0
         except Exception as e:
             logger.error(f"Error getting balance for {address}: {e}")
@@ -106,24 +283,19 @@ class BitcoinManager:
         Obtiene UTXOs para una dirección
         """
         try:
-            for attempt in range(RETRY_ATTEMPTS):
-                try:
-                    response = requests.get(
-                        f"{BLOCKSTREAM_API}/address/{address}/utxo", 
-                        timeout=API_TIMEOUT
-                    )
-                    if response.status_code == 200:
-                        utxos = response.json()
-                        logger.info(f"Found {len(utxos)} UTXOs for {address}")
-                        return utxos
-                    else:
-                        logger.warning(f"API returned status {response.status_code} for UTXOs {address}")
-                        
-                except requests.RequestException as e:
-                    logger.warning(f"UTXO API attempt {attempt + 1} failed: {e}")
-                    if attempt < RETRY_ATTEMPTS - 1:
-                        time.sleep(2)
-                        
+            response = self.session.get(
+                f"{BLOCKSTREAM_API}/address/{address}/utxo",
+                timeout=API_TIMEOUT
+            )
+            if response.status_code == 200:
+                utxos = _parse_json(response)
+                logger.info(f"Found {len(utxos)} UTXOs for {address}")
+                return utxos
+
+            logger.warning(f"API returned status {response.status_code} for UTXOs {address}")
+            return []
+        except requests.RequestException as e:
+            logger.warning(f"UTXO API request failed for {address}: {e}")
             return []
         except Exception as e:
             logger.error(f"Error getting UTXOs for {address}: {e}")
@@ -132,97 +304,269 @@ class BitcoinManager:
     def get_transaction_info(self, txid: str) -> dict:
         """
         Obtiene información de transacción
+        Usa cache con TTL para no repetir la consulta en cada ciclo de monitoreo
         """
+        cached = self._tx_cache.get(txid)
+        if cached is not None:
+            return cached
+
         try:
-            for attempt in range(RETRY_ATTEMPTS):
-                try:
-                    response = requests.get(
-                        f"{BLOCKSTREAM_API}/tx/{txid}", 
-                        timeout=API_TIMEOUT
-                    )
-                    if response.status_code == 200:
-                        tx_data = response.json()
-                        logger.info(f"Transaction {txid} found")
-                        return tx_data
-                    else:
-                        logger.warning(f"API returned status {response.status_code} for tx {txid}")
-                        
-                except requests.RequestException as e:
-                    logger.warning(f"TX API attempt {attempt + 1} failed: {e}")
-                    if attempt < RETRY_ATTEMPTS - 1:
-                        time.sleep(2)
-                        
+            response = self.session.get(
+                f"{BLOCKSTREAM_API}/tx/{txid}",
+                timeout=API_TIMEOUT
+            )
+            if response.status_code == 200:
+                tx_data = _parse_json(response)
+                logger.info(f"Transaction {txid} found")
+                self._tx_cache.set(txid, tx_data)
+                return tx_data
+
+            logger.warning(f"API returned status {response.status_code} for tx {txid}")
+            return {}
+        except requests.RequestException as e:
+            logger.warning(f"TX API request failed for {txid}: {e}")
             return {}
         except Exception as e:
             logger.error(f"Error getting transaction info for {txid}: {e}")
             return {}
     
+    def get_transaction_status(self, txid: str) -> dict:
+        """
+        Obtiene solo el estado de confirmación de una transacción (/tx/{txid}/status)
+        Mucho más liviano que la transacción completa; cacheado por TX_CACHE_TTL segundos
+        """
+        # Si la transacción completa ya está en cache, su estado también
+        cached_tx = self._tx_cache.get(txid)
+        if cached_tx is not None and 'status' in cached_tx:
+            return cached_tx['status']
+
+        cached = self._status_cache.get(txid)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.session.get(
+                f"{BLOCKSTREAM_API}/tx/{txid}/status",
+                timeout=API_TIMEOUT
+            )
+            if response.status_code == 200:
+                status = _parse_json(response)
+                self._status_cache.set(txid, status)
+                return status
+
+            logger.warning(f"API returned status {response.status_code} for tx status {txid}")
+            return {}
+        except requests.RequestException as e:
+            logger.warning(f"TX status API request failed for {txid}: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Error getting transaction status for {txid}: {e}")
+            return {}
+
+    def invalidate_transaction(self, txid: str) -> None:
+        """Descarta la información cacheada de una transacción (al cambiar de estado un deal)"""
+        self._tx_cache.pop(txid)
+        self._status_cache.pop(txid)
+        self._confirmations_cache.pop(txid)
+        self._block_height_cache.pop(txid)
+
     def get_transaction_confirmations(self, txid: str) -> int:
         """
         Obtiene número de confirmaciones para una transacción
         FUNCIÓN CLAVE: Usada por el bot para verificar confirmaciones Bitcoin
         """
+        cached = self._cached_confirmations(txid)
+        if cached is not None:
+            return cached
+
+        known = self._confirmations_from_block_height(txid, self._tip_cache.get('tip'))
+        if known is not None:
+            return known
+
         try:
-            tx_data = self.get_transaction_info(txid)
-            if not tx_data:
+            # /tx/{txid}/status y /blocks/tip/height son independientes: lanzarlas en paralelo
+            tip_future = self._executor.submit(self._get_tip_height)
+            status = self.get_transaction_status(txid)
+            if not status:
                 logger.warning(f"No transaction data found for {txid}")
                 return 0
                 
             # Verificar si la transacción está confirmada
-            if 'status' in tx_data and tx_data['status'].get('confirmed'):
+            if status.get('confirmed'):
                 # Obtener altura actual del blockchain
-                for attempt in range(RETRY_ATTEMPTS):
-                    try:
-                        tip_response = requests.get(
-                            f"{BLOCKSTREAM_API}/blocks/tip/height", 
-                            timeout=API_TIMEOUT
-                        )
-                        if tip_response.status_code == 200:
-                            current_height = int(tip_response.text)
-                            tx_height = tx_data['status']['block_height']
-                            confirmations = current_height - tx_height + 1
-                            logger.info(f"TX {txid}: {confirmations} confirmations (height {tx_height}/{current_height})")
-                            return confirmations
-                    except requests.RequestException as e:
-                        logger.warning(f"Block height API attempt {attempt + 1} failed: {e}")
-                        if attempt < RETRY_ATTEMPTS - 1:
-                            time.sleep(2)
+                return self._confirmations_from_status(txid, status, tip_future.result())
             else:
                 logger.info(f"TX {txid} not confirmed yet (in mempool)")
+                self._store_confirmations(txid, self._tip_cache.get('tip'), 0)
                 return 0
                 
         except Exception as e:
             logger.error(f"Error getting confirmations for {txid}: {e}")
             return 0
+
+    def _cached_confirmations(self, txid: str):
+        """
+        Confirmaciones cacheadas si se calcularon con la altura del tip actual
+        Un bloque nuevo cambia el tip y vuelve obsoleta la entrada sin invalidarla a mano
+        """
+        entry = self._confirmations_cache.get(txid)
+        if entry is None:
+            return None
+        tip_height, confirmations = entry
+        if tip_height is None or tip_height != self._tip_cache.get('tip'):
+            return None
+        return confirmations
+
+    def _confirmations_from_block_height(self, txid: str, current_height):
+        """
+        Confirmaciones calculadas localmente si ya conocemos el bloque de la transacción
+        Con un bloque nuevo basta con tip - altura + 1, sin volver a pedir /tx/{txid}/status
+        Retorna None si la transacción aún no tiene bloque conocido
+        """
+        tx_height = self._block_height_cache.get(txid)
+        if tx_height is None or current_height is None:
+            return None
+        confirmations = current_height - tx_height + 1
+        self._store_confirmations(txid, current_height, confirmations)
+        return confirmations
+
+    def _store_confirmations(self, txid: str, tip_height, confirmations: int) -> None:
+        """Guarda las confirmaciones junto con la altura del tip usada para calcularlas"""
+        if tip_height is not None:
+            self._confirmations_cache.set(txid, (tip_height, confirmations))
+
+    def get_transaction_confirmations_batch(self, txids) -> dict:
+        """
+        Confirmaciones de varias transacciones: {txid: confirmaciones}
+        Una sola lectura del tip y los /tx/{txid}/status en paralelo en el pool
+        Las transacciones cuya consulta falla no aparecen en el resultado (y no se cachean)
+        """
+        txids = list(dict.fromkeys(txid for txid in txids if txid))
+        if not txids:
+            return {}
+
+        results = {}
+        for txid in txids:
+            cached = self._cached_confirmations(txid)
+            if cached is not None:
+                results[txid] = cached
+        txids = [txid for txid in txids if txid not in results]
+        if not txids:
+            return results
+
+        current_height = self._get_tip_height()
+        for txid in txids:
+            known = self._confirmations_from_block_height(txid, current_height)
+            if known is not None:
+                results[txid] = known
+        txids = [txid for txid in txids if txid not in results]
+
+        for txid, status in zip(txids, self._executor.map(self.get_transaction_status, txids)):
+            try:
+                if not status:
+                    # Falla de la API: no es lo mismo que "sin confirmar", no cachear
+                    logger.warning(f"No transaction data found for {txid}")
+                elif not status.get('confirmed'):
+                    results[txid] = 0
+                    self._store_confirmations(txid, current_height, 0)
+                elif current_height is not None:
+                    results[txid] = self._confirmations_from_status(txid, status, current_height)
+            except Exception as e:
+                logger.error(f"Error getting confirmations for {txid}: {e}")
+        return results
+
+    def _confirmations_from_status(self, txid: str, status: dict, current_height) -> int:
+        """Calcula confirmaciones de un status confirmado dada la altura del tip"""
+        if current_height is None:
+            return 0
+
+        tx_height = status['block_height']
+        self._block_height_cache.set(txid, tx_height)
+        confirmations = current_height - tx_height + 1
+        logger.info(f"TX {txid}: {confirmations} confirmations (height {tx_height}/{current_height})")
+
+        # Con confirmaciones profundas el block_height ya no cambia: cachear más tiempo
+        if confirmations > DEEP_CONFIRMATIONS:
+            self._status_cache.set(txid, status, ttl=TX_CACHE_DEEP_TTL)
+        self._store_confirmations(txid, current_height, confirmations)
+        return confirmations
     
+    def _get_tip_height(self):
+        """
+        Obtiene la altura actual del blockchain
+        Normalmente la lee del cache que mantiene el hilo _tip_watcher_loop;
+        solo consulta la API si el cache está vacío (arranque o API caída)
+        Retorna None si la API no responde
+        """
+        self._ensure_tip_watcher()
+        cached = self._tip_cache.get('tip')
+        if cached is not None:
+            return cached
+        return self._fetch_tip_height()
+
+    def _ensure_tip_watcher(self):
+        """Arranca (una sola vez) el hilo que refresca la altura del tip en segundo plano"""
+        if self._tip_watcher is not None:
+            return
+
+        with self._tip_watcher_lock:
+            if self._tip_watcher is None:
+                self._tip_watcher = threading.Thread(
+                    target=self._tip_watcher_loop,
+                    name='bitcoin-tip-watcher',
+                    daemon=True
+                )
+                self._tip_watcher.start()
+
+    def _tip_watcher_loop(self):
+        """Refresca la altura del tip cada TIP_CACHE_TTL segundos hasta que se detenga el manager"""
+        while not self._stop_event.is_set():
+            self._fetch_tip_height()
+            self._stop_event.wait(TIP_CACHE_TTL)
+
+    def _fetch_tip_height(self):
+        """Consulta /blocks/tip/height y guarda el resultado en cache"""
+        try:
+            response = self.session.get(
+                f"{BLOCKSTREAM_API}/blocks/tip/height",
+                timeout=API_TIMEOUT
+            )
+            if response.status_code == 200:
+                height = int(response.text)
+                # TTL doble: el watcher lo renueva antes de que expire
+                self._tip_cache.set('tip', height, ttl=TIP_CACHE_TTL * 2)
+                return height
+
+            logger.warning(f"API returned status {response.status_code} for tip height")
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Block height API request failed: {e}")
+        return None
+
     def verify_payment_to_address(self, address: str, expected_amount: int, txid: str = None) -> dict:
         """
         Verifica si se hizo un pago a una dirección
         FUNCIÓN CLAVE: Usada por el bot para verificar depósitos Bitcoin
         """
         try:
-            utxos = self.get_address_utxos(address)
-            
-            for utxo in utxos:
-                # Si se proporciona txid, solo verificar esa transacción específica
-                if txid and utxo.get('txid') != txid:
-                    continue
-                    
+            if txid:
+                # Con txid conocido basta consultar esa transacción (sin listar UTXOs)
+                # La altura del tip se precarga en paralelo para calcular confirmaciones
+                self._executor.submit(self._get_tip_height)
+                tx_data = self.get_transaction_info(txid)
+                for vout, output in enumerate(tx_data.get('vout', [])):
+                    if (output.get('scriptpubkey_address') == address
+                            and output.get('value', 0) == expected_amount):
+                        return self._payment_found(txid, output['value'], vout)
+            else:
+                utxos = self.get_address_utxos(address)
+
                 # Verificar si el monto coincide
-                if utxo.get('value', 0) == expected_amount:
-                    confirmations = self.get_transaction_confirmations(utxo['txid'])
-                    
-                    result = {
-                        'found': True,
-                        'txid': utxo['txid'],
-                        'amount': utxo['value'],
-                        'confirmations': confirmations,
-                        'confirmed': confirmations >= 3,
-                        'vout': utxo.get('vout', 0)
-                    }
-                    
-                    logger.info(f"Payment verification result: {result}")
-                    return result
+                candidates = [utxo for utxo in utxos if utxo.get('value', 0) == expected_amount]
+                if len(candidates) == 1:
+                    utxo = candidates[0]
+                    return self._payment_found(utxo['txid'], utxo['value'], utxo.get('vout', 0))
+                if candidates:
+                    return self._best_candidate(candidates)
             
             # No se encontró pago matching
             return {
@@ -243,33 +587,86 @@ class BitcoinManager:
                 'confirmed': False
             }
     
-    def monitor_address(self, address: str, expected_amount: int, timeout: int = 3600) -> dict:
+    def _best_candidate(self, candidates: list) -> dict:
+        """
+        Consulta en paralelo las confirmaciones de varios UTXOs con el monto esperado
+        y retorna el más confirmado
+        """
+        # Pool propio: get_transaction_confirmations ya usa self._executor internamente
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_UTXOS, len(candidates))) as executor:
+            confirmations = list(executor.map(
+                lambda utxo: self.get_transaction_confirmations(utxo['txid']),
+                candidates
+            ))
+
+        best = max(range(len(candidates)), key=lambda i: confirmations[i])
+        utxo = candidates[best]
+        return self._payment_found(utxo['txid'], utxo['value'], utxo.get('vout', 0), confirmations[best])
+
+    def _payment_found(self, txid: str, amount: int, vout: int, confirmations: int = None) -> dict:
+        """
+        Construye el resultado de un pago encontrado incluyendo sus confirmaciones
+        """
+        if confirmations is None:
+            confirmations = self.get_transaction_confirmations(txid)
+
+        result = {
+            'found': True,
+            'txid': txid,
+            'amount': amount,
+            'confirmations': confirmations,
+            'confirmed': confirmations >= 3,
+            'vout': vout
+        }
+
+        logger.info(f"Payment verification result: {result}")
+        return result
+    
+    async def monitor_address(self, address: str, expected_amount: int, timeout: int = 3600) -> dict:
         """
         Monitorea dirección para transacción entrante
         Retorna información detallada del pago cuando se encuentra
+
+        Es una corrutina: muchos monitores comparten el event loop en lugar de
+        ocupar un thread cada uno durante todo el timeout
         """
-        start_time = time.time()
         logger.info(f"Monitoring {address} for {expected_amount} sats (timeout: {timeout}s)")
-        
-        while time.time() - start_time < timeout:
-            result = self.verify_payment_to_address(address, expected_amount)
-            
+
+        try:
+            return await asyncio.wait_for(
+                self._poll_address(address, expected_amount),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Timeout waiting for payment to {address}")
+            return {
+                'found': False,
+                'error': 'Timeout',
+                'confirmed': False,
+                'timeout': True
+            }
+
+    async def _poll_address(self, address: str, expected_amount: int) -> dict:
+        """
+        Consulta la dirección hasta encontrar el pago
+        El intervalo entre consultas crece exponencialmente (30s, 60s, 120s...)
+        hasta MAX_MONITOR_INTERVAL para no repetir llamadas API sin cambios
+        """
+        attempt = 0
+
+        while True:
+            result = await asyncio.to_thread(self.verify_payment_to_address, address, expected_amount)
+
             if result['found'] and result['confirmed']:
                 logger.info(f"Payment confirmed: {result}")
                 return result
             elif result['found']:
                 logger.info(f"Payment found but not confirmed: {result['confirmations']}/3")
                 return result
-            
-            time.sleep(MONITOR_INTERVAL)
-        
-        logger.warning(f"Timeout waiting for payment to {address}")
-        return {
-            'found': False,
-            'error': 'Timeout',
-            'confirmed': False,
-            'timeout': True
-        }
+
+            delay = min(MONITOR_INTERVAL * 2 ** attempt, MAX_MONITOR_INTERVAL)
+            attempt += 1
+            await asyncio.sleep(delay)
 
 # =============================================================================
 # FUNCIONES LIGHTNING NETWORK
@@ -277,12 +674,10 @@ class BitcoinManager:
 
 def extract_payment_hash_from_invoice(invoice):
     """Extract payment hash from Lightning invoice using LND"""
-    from lightning_utils import extract_payment_hash_from_invoice as lnd_extract
     return lnd_extract(invoice)
 
 def check_lightning_payment_status(payment_hash):
     """Check if Lightning payment is settled using LND"""
-    from lightning_utils import check_lightning_payment_status as lnd_check
     return lnd_check(payment_hash)
 
     """
@@ -316,18 +711,35 @@ def check_lightning_payment_status(payment_hash):
 # Instancia global del manager
 bitcoin_manager = BitcoinManager()
 
+# Cache de balances por dirección (los balances solo cambian con nuevos bloques)
+_balance_cache = TTLCache(maxsize=1024, ttl=BALANCE_CACHE_TTL)
+
+@lru_cache(maxsize=4096)
 def validate_bitcoin_address(address: str) -> bool:
     """
     FUNCIÓN PÚBLICA: Validar dirección Bitcoin
     Usada por el bot en comando /address
+    Resultado memoizado: depende solo de la dirección y la red configurada
     """
     return bitcoin_manager.validate_address(address)
 
 def get_address_balance(address: str) -> int:
     """
     FUNCIÓN PÚBLICA: Obtener balance de dirección
+    Cacheado por BALANCE_CACHE_TTL segundos
     """
-    return bitcoin_manager.get_address_balance(address)
+    balance = _balance_cache.get(address)
+    if balance is None:
+        balance = bitcoin_manager.get_address_balance(address)
+        _balance_cache.set(address, balance)
+    return balance
+
+def invalidate_address(address: str) -> None:
+    """
+    FUNCIÓN PÚBLICA: Descartar el balance cacheado de una dirección
+    Llamar después de ver una confirmación nueva para forzar una consulta fresca
+    """
+    _balance_cache.pop(address)
 
 def verify_payment(address: str, amount: int, txid: str = None) -> dict:
     """
@@ -342,11 +754,19 @@ def get_confirmations(txid: str) -> int:
     """
     return bitcoin_manager.get_transaction_confirmations(txid)
 
-def monitor_payment(address: str, amount: int, timeout: int = 3600) -> dict:
+def get_confirmations_batch(txids) -> dict:
+    """
+    FUNCIÓN PÚBLICA: Confirmaciones de varias transacciones en una sola pasada
+    Retorna {txid: confirmaciones}
+    """
+    return bitcoin_manager.get_transaction_confirmations_batch(txids)
+
+async def monitor_payment(address: str, amount: int, timeout: int = 3600) -> dict:
     """
     FUNCIÓN PÚBLICA: Monitorear pago a dirección
+    Corrutina - usar con await o asyncio.create_task desde el bot
     """
-    return bitcoin_manager.monitor_address(address, amount, timeout)
+    return await bitcoin_manager.monitor_address(address, amount, timeout)
 
 def get_transaction_info(txid: str) -> dict:
     """
@@ -354,6 +774,64 @@ def get_transaction_info(txid: str) -> dict:
     """
     return bitcoin_manager.get_transaction_info(txid)
 
+def get_tip_height():
+    """
+    FUNCIÓN PÚBLICA: Altura actual del blockchain (None si la API no responde)
+    Las confirmaciones solo cambian cuando esta altura cambia
+    """
+    return bitcoin_manager._get_tip_height()
+
+def invalidate_transaction(txid: str) -> None:
+    """
+    FUNCIÓN PÚBLICA: Descartar cache de una transacción
+    Llamar cuando un deal cambia de estado para forzar una consulta fresca
+    """
+    bitcoin_manager.invalidate_transaction(txid)
+
+def close_bitcoin_manager() -> None:
+    """
+    FUNCIÓN PÚBLICA: Liberar conexiones y hilos del manager
+    Usada por el bot en post_shutdown
+    """
+    bitcoin_manager.close()
+
+# =============================================================================
+# FUNCIONES PÚBLICAS ASÍNCRONAS - PARA HANDLERS Y MONITORES DEL BOT
+# =============================================================================
+# Ejecutan las llamadas HTTP en un thread para no bloquear el event loop de
+# Telegram; varias verificaciones pueden avanzar en paralelo compartiendo el
+# pool de conexiones del manager
+
+async def verify_payment_async(address: str, amount: int, txid: str = None) -> dict:
+    """
+    FUNCIÓN PÚBLICA: Verificar pago a dirección sin bloquear el event loop
+    """
+    return await asyncio.to_thread(bitcoin_manager.verify_payment_to_address, address, amount, txid)
+
+async def get_confirmations_async(txid: str) -> int:
+    """
+    FUNCIÓN PÚBLICA: Obtener confirmaciones sin bloquear el event loop
+    """
+    return await asyncio.to_thread(bitcoin_manager.get_transaction_confirmations, txid)
+
+async def get_confirmations_batch_async(txids) -> dict:
+    """
+    FUNCIÓN PÚBLICA: Confirmaciones de varias transacciones sin bloquear el event loop
+    """
+    return await asyncio.to_thread(bitcoin_manager.get_transaction_confirmations_batch, txids)
+
+async def get_address_balance_async(address: str) -> int:
+    """
+    FUNCIÓN PÚBLICA: Obtener balance de dirección sin bloquear el event loop
+    """
+    return await asyncio.to_thread(bitcoin_manager.get_address_balance, address)
+
+async def get_transaction_info_async(txid: str) -> dict:
+    """
+    FUNCIÓN PÚBLICA: Obtener información de transacción sin bloquear el event loop
+    """
+    return await asyncio.to_thread(bitcoin_manager.get_transaction_info, txid)
+
 # =============================================================================
 # FUNCIONES DE TESTING Y DEBUG
 # =============================================================================
@@ -378,7 +856,7 @@ def test_bitcoin_functions():
     
     # Test de conexión API
     try:
-        response = requests.get(f"{BLOCKSTREAM_API}/blocks/tip/height", timeout=5)
+        response = bitcoin_manager.session.get(f"{BLOCKSTREAM_API}/blocks/tip/height", timeout=5)
         if response.status_code == 200:
             logger.info(f"API connection successful. Current block: {response.text}")
         else:
@@ -22,18 +22,31 @@ Version: Optimized for production - Clean English implementation
 """
 
 import os
+import re
 import logging
 import asyncio
 import time
-import threading
+import random
+from collections import defaultdict, deque
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
+from sqlalchemy import or_, select, update
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
+from telegram.error import BadRequest, Forbidden, RetryAfter
+from telegram.helpers import escape_markdown
 
 # Import database models
-from database.models import get_db, User, Offer, Deal, create_tables
-from message_manager import MessageManager
+from database.models import get_db, session_scope, register_user, User, Offer, Deal, create_tables
+from cache_utils import TTLCache
+from message_manager import MessageManager, format_amount
+from bitcoin_utils import (
+    extract_payment_hash_from_invoice, validate_bitcoin_address, verify_payment_async,
+    get_tip_height, get_confirmations_batch_async,
+    invalidate_transaction, check_lightning_payment_status, close_bitcoin_manager
+)
+from lightning_utils import LN_INVOICE_RE
+from lnproxy_utils import wrap_invoice_for_privacy, close_lnproxy_client
 
 # Import logging system
 from logger_config import get_swap_logger, init_logging
@@ -47,6 +60,19 @@ msg = None
 # Global swap logger instance
 swap_logger = None
 
+# Channel post queue and its worker task (created in post_init)
+channel_queue = None
+channel_worker_task = None
+
+# Telegram application built once in main(); notifications reuse its bot
+BOT_APP = None
+
+# Background scheduler task (created in post_init on the application's event loop)
+scheduler_task = None
+
+# monitor_confirmations state: deal_id -> tip height of the last check
+_confirmations_checked_at_tip = {}
+
 # =============================================================================
 # CORE CONFIGURATION - MODIFY HERE FOR QUICK CHANGES
 # =============================================================================
@@ -71,8 +97,35 @@ BITCOIN_CONFIRMATION_HOURS = 48    # Maximum time for 3 Bitcoin confirmations
 LIGHTNING_INVOICE_HOURS = 2        # Time to send Lightning invoice after Bitcoin confirmed
 LIGHTNING_PAYMENT_HOURS = 2        # Time to pay Lightning invoice
 CONFIRMATION_COUNT = 3             # Required Bitcoin confirmations
-CONFIRMATION_CHECK_MINUTES = 10    # Check confirmations every 10 minutes
+CONFIRMATION_CHECK_MINUTES = 10    # Fallback confirmation check interval when tip height is unavailable
+BLOCK_POLL_SECONDS = 60            # How often to look for a new block (confirmations only change then)
+LIGHTNING_CHECK_SECONDS = 30       # Lightning payment verification interval
+IDLE_CHECK_SECONDS = 600           # Monitor interval while nothing is pending (handlers wake it early)
+TIMEOUT_CHECK_SECONDS = 300        # Expired deal cleanup interval
+LNPROXY_RETRY_CHECK_SECONDS = 300  # lnproxy retry check interval
+SCHEDULER_ERROR_SECONDS = 300      # Delay before re-running a job that raised
 BATCH_WAIT_MINUTES = 60            # Maximum wait time for Bitcoin batch (or min 3 requests)
+MIN_BATCH_SIZE = 3                 # Minimum deals to process a batch before BATCH_WAIT_MINUTES
+BATCH_CHECK_SECONDS = 3600         # Batch checks run aligned to this period (top of every hour)
+
+# Deal status groups - shared by queries instead of rebuilding the lists on every call
+ACTIVE_DEAL_STATUSES = ('pending', 'accepted', 'bitcoin_sent', 'bitcoin_confirmed', 'lightning_invoice_received')
+TXID_DEAL_STATUSES = ('accepted', 'bitcoin_sent')  # Deals that can still receive a TXID
+
+# Bitcoin transaction ID: 32 bytes in hex (normalized to lowercase before matching)
+TXID_RE = re.compile(r'^[0-9a-f]{64}$')
+
+# Channel posting - offers created close together are sent as one message
+CHANNEL_COALESCE_SECONDS = 0.75    # Wait this long for more offers before posting
+CHANNEL_MESSAGE_LIMIT = 4096       # Telegram maximum message length
+NOTIFY_CONCURRENCY = 25            # Concurrent sends when notifying many users (Telegram allows ~30 msg/s)
+SEND_RATE_PER_SECOND = 30          # Bot-wide notification budget (Telegram global limit)
+TELEGRAM_POOL_SIZE = 64            # Keep-alive connections to the Bot API shared by handlers and jobs
+TELEGRAM_POOL_TIMEOUT = 10         # Seconds a send may wait for a free pooled connection
+
+# User lookups - profile rows change rarely, so keep them in memory for a while
+USER_CACHE_TTL = 300               # Seconds a cached user row is reused
+USER_CACHE_SIZE = 10000            # Maximum cached users
 
 # Configure logging
 logging.basicConfig(
@@ -85,14 +138,16 @@ logger = logging.getLogger(__name__)
 # UTILITY FUNCTIONS
 # =============================================================================
 
-def format_amount(amount):
-    """Format amounts with dots as thousand separators (Latino format)"""
-    return f"{amount:,}".replace(",", ".")
+def md(value):
+    """Escape a user-supplied value for Markdown messages (usernames may contain _ or *)"""
+    return escape_markdown(str(value), version=1)
 
 async def send_message_with_retry(context, chat_id, text, parse_mode='Markdown', max_retries=3):
     """
     Send message with retry logic for critical notifications
-    Implements exponential backoff: 1s, 2s, 4s delays
+    Flood limits wait the retry_after Telegram asks for; network errors use
+    jittered exponential backoff (~1s, 2s, 4s) so parallel notifications
+    don't retry in lockstep. Bad requests and blocked chats are not retried.
     """
     for attempt in range(max_retries):
         try:
@@ -103,21 +158,115 @@ async def send_message_with_retry(context, chat_id, text, parse_mode='Markdown',
             )
             logger.info(f'Message sent successfully to {chat_id} on attempt {attempt + 1}')
             return True
+        except (BadRequest, Forbidden) as e:
+            logger.error(f'Message to {chat_id} rejected, not retrying: {e}')
+            return False
+        except RetryAfter as e:
+            retry_after = e.retry_after.total_seconds() if isinstance(e.retry_after, timedelta) else e.retry_after
+            delay = retry_after + random.uniform(0, 0.3)
+            logger.warning(f'Flood limit sending to {chat_id} on attempt {attempt + 1}, waiting {delay:.1f}s')
         except Exception as e:
+            backoff = 2 ** attempt
+            delay = min(60, backoff + random.uniform(0, 0.5 * backoff))
             logger.warning(f'Failed to send message to {chat_id} on attempt {attempt + 1}: {e}')
-            if attempt < max_retries - 1:
-                delay = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                logger.info(f'Retrying in {delay} seconds...')
-                await asyncio.sleep(delay)
-            else:
-                logger.error(f'All {max_retries} attempts failed to send message to {chat_id}')
-                return False
+
+        if attempt < max_retries - 1:
+            logger.info(f'Retrying in {delay:.1f} seconds...')
+            await asyncio.sleep(delay)
+
+    logger.error(f'All {max_retries} attempts failed to send message to {chat_id}')
     return False
 
+def get_bot():
+    """Shared bot client for notifications (handlers and monitors run on the same loop)"""
+    return BOT_APP.bot
+
+# Start times of notifications sent in the last second (token bucket refilled by sliding window)
+_recent_sends = deque()
+
+async def throttle_send():
+    """
+    Wait until another notification fits in SEND_RATE_PER_SECOND
+    Runs on the event loop only, so no lock is needed
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        now = loop.time()
+        while _recent_sends and now - _recent_sends[0] >= 1:
+            _recent_sends.popleft()
+        if len(_recent_sends) < SEND_RATE_PER_SECOND:
+            _recent_sends.append(now)
+            return
+        await asyncio.sleep(1 - (now - _recent_sends[0]))
+
+async def send_bulk_messages(bot, messages):
+    """
+    Send independent notifications concurrently
+    messages: list of (chat_id, text); at most NOTIFY_CONCURRENCY in flight.
+    A failed send is logged and does not stop the others. Returns the number sent.
+    """
+    semaphore = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+
+    async def _send(chat_id, text):
+        async with semaphore:
+            await throttle_send()
+            await bot.send_message(chat_id=chat_id, text=text)
+
+    results = await asyncio.gather(
+        *(_send(chat_id, text) for chat_id, text in messages),
+        return_exceptions=True
+    )
+    for (chat_id, _), result in zip(messages, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to notify {chat_id}: {result}")
+    return sum(1 for result in results if not isinstance(result, Exception))
+
+async def send_pair(*sends):
+    """
+    Run the buyer and seller notifications of one deal concurrently
+    Both sends are attempted; the first failure is re-raised for the caller to log
+    """
+    async def _throttled(send):
+        await throttle_send()
+        return await send
+
+    results = await asyncio.gather(*(_throttled(send) for send in sends), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+# telegram_id -> User row (detached, read-only); only registered users are cached
+# Writes that touch a user's data (create_offer, accept_deal) drop the entry
+_user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+def get_user_cached(db, telegram_id):
+    """
+    User row by Telegram ID, served from _user_cache when possible
+    Returns None for unregistered users (not cached, so registration shows up at once)
+    """
+    user_data = _user_cache.get(telegram_id)
+    if user_data is None:
+        user_data = db.query(User).filter(User.telegram_id == telegram_id).first()
+        if user_data is not None:
+            _user_cache.set(telegram_id, user_data)
+    return user_data
+
+async def run_db(fn, *args):
+    """
+    Run a blocking database function in a worker thread
+    Keeps the event loop free to process other updates during SQLite/Postgres I/O
+    """
+    return await asyncio.to_thread(fn, *args)
+
 # =============================================================================
 # SECTION 1: BASIC COMMANDS (/start, /help, /profile)
 # =============================================================================
 
+def _register_user_db(user):
+    """Register a Telegram user (runs in a worker thread); True if newly created"""
+    with session_scope() as db:
+        return register_user(db, user.id, user.username, user.first_name)
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Command /start - Register user automatically
@@ -125,23 +274,10 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     user = update.effective_user
     
-    # Register user in database
-    db = get_db()
-    existing_user = db.query(User).filter(User.telegram_id == user.id).first()
-    
-    if not existing_user:
-        new_user = User(
-            telegram_id=user.id,
-            username=user.username,
-            first_name=user.first_name,
-            bitcoin_address="",
-            reputation_score=5.0,
-            total_deals=0,
-            total_volume=0
-        )
-        db.add(new_user)
-        db.commit()
-
+    # Register user in database (single INSERT ... ON CONFLICT DO NOTHING)
+    created = await run_db(_register_user_db, user)
+    
+    if created:
         # Log new user registration
         swap_logger.log_user_registration(
             user_id=user.id,
@@ -158,8 +294,6 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         )
         logger.info(f"Existing user: {user.id} ({user.username})")
 
-    db.close()
-
     # Log command execution
     swap_logger.log_command(user_id=user.id, command='/start')
 
@@ -174,6 +308,11 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     await update.message.reply_text(msg.get_message('MSG-002'))
 
+def _get_user_db(telegram_id):
+    """Load a user row by Telegram ID (runs in a worker thread)"""
+    with get_db() as db:
+        return get_user_cached(db, telegram_id)
+
 async def profile(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Command /profile - View user statistics"""
     user = update.effective_user
@@ -181,9 +320,7 @@ async def profile(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     # Log command execution
     swap_logger.log_command(user_id=user.id, command='/profile')
 
-    db = get_db()
-    user_data = db.query(User).filter(User.telegram_id == user.id).first()
-    db.close()
+    user_data = await run_db(_get_user_db, user.id)
 
     if not user_data:
         # Log user not found
@@ -199,15 +336,15 @@ async def profile(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 👤 **Your Profile**
 
 ID: {user_data.telegram_id}
-User: @{user_data.username or 'Not set'}
-Name: {user_data.first_name}
+User: @{md(user_data.username or 'Not set')}
+Name: {md(user_data.first_name)}
 
 **Stats:**
 Completed: {user_data.total_deals}
 Rating: {'⭐' * int(user_data.reputation_score)} ({user_data.reputation_score}/5.0)
 Volume: {format_amount(user_data.total_volume)} sats
 
-**Bitcoin address:** {user_data.bitcoin_address or 'Not set'}
+**Bitcoin address:** {md(user_data.bitcoin_address or 'Not set')}
     """
     await update.message.reply_text(profile_text, parse_mode='Markdown')
 
@@ -215,6 +352,16 @@ Volume: {format_amount(user_data.total_volume)} sats
 # SECTION 2: OFFER CREATION (/swapout, /swapin)
 # =============================================================================
 
+# Amount keyboards - AMOUNTS is fixed, so build the markups once
+SWAPOUT_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton(format_amount(amount), callback_data=f"swapout_{amount}")]
+    for amount in AMOUNTS
+])
+SWAPIN_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton(format_amount(amount), callback_data=f"swapin_{amount}")]
+    for amount in AMOUNTS
+])
+
 async def swapout(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Command /swapout - Ana creates Lightning → Bitcoin offer
@@ -229,18 +376,9 @@ async def swapout(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         details={'available_amounts': AMOUNTS}
     )
 
-    keyboard = []
-
-    # Create buttons for each available amount
-    for amount in AMOUNTS:
-        text = format_amount(amount)
-        keyboard.append([InlineKeyboardButton(text, callback_data=f"swapout_{amount}")])
-
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
     await update.message.reply_text(
         msg.get_message('MSG-035'),
-        reply_markup=reply_markup
+        reply_markup=SWAPOUT_MARKUP
     )
 
 async def swapin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -254,17 +392,9 @@ async def swapin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         details={'available_amounts': AMOUNTS}
     )
 
-    keyboard = []
-
-    for amount in AMOUNTS:
-        text = format_amount(amount)
-        keyboard.append([InlineKeyboardButton(text, callback_data=f"swapin_{amount}")])
-
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
     await update.message.reply_text(
         msg.get_message('MSG-036'),
-        reply_markup=reply_markup
+        reply_markup=SWAPIN_MARKUP
     )
 
 # =============================================================================
@@ -288,23 +418,12 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         context='button_handler'
     )
 
-    # Auto-register user if doesn't exist
-    db = get_db()
-    user_data = db.query(User).filter(User.telegram_id == user.id).first()
-
-    if not user_data:
-        new_user = User(
-            telegram_id=user.id,
-            username=user.username,
-            first_name=user.first_name,
-            bitcoin_address="",
-            reputation_score=5.0,
-            total_deals=0,
-            total_volume=0
-        )
-        db.add(new_user)
-        db.commit()
+    # Auto-register user if doesn't exist (a cached row means already registered)
+    created = False
+    if _user_cache.get(user.id) is None:
+        created = await run_db(_register_user_db, user)
 
+    if created:
         # Log auto-registration
         swap_logger.log_user_registration(
             user_id=user.id,
@@ -313,114 +432,98 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
         logger.info(f"Auto-registered user: {user.id} ({user.username})")
     
-    # Process different button types
+    # Process different button types - each handler runs its DB work in one worker-thread session
     if data.startswith("swapout_"):
         amount = int(data.split("_")[1])
-        await create_offer(query, user, amount, "swapout", db)
+        await create_offer(query, user, amount, "swapout")
     elif data.startswith("swapin_"):
         amount = int(data.split("_")[1])
-        await create_offer(query, user, amount, "swapin", db)
+        await create_offer(query, user, amount, "swapin")
     elif data.startswith("accept_deal_"):
         deal_id = int(data.split("_")[2])
-        await accept_deal(query, user, deal_id, db)
+        await accept_deal(query, user, deal_id)
     elif data.startswith("cancel_deal_"):
         deal_id = int(data.split("_")[2])
-        await cancel_deal(query, user, deal_id, db)
+        await cancel_deal(query, user, deal_id)
     elif data.startswith("reveal_invoice_"):
         deal_id = int(data.split("_")[2])
-        await handle_reveal_invoice(query, user, deal_id, db)
+        await handle_reveal_invoice(query, user, deal_id)
     elif data.startswith("retry_lnproxy_"):
         deal_id = int(data.split("_")[2])
-        await handle_retry_lnproxy(query, user, deal_id, db)
+        await handle_retry_lnproxy(query, user, deal_id)
+
+def _create_offer_db(user_id, amount, offer_type):
+    """
+    Insert a new active offer (runs in a worker thread)
+    Returns (offer_id, total_swaps) - the creator's deal count comes from _user_cache when possible
+    """
+    with session_scope() as db:
+        user_data = get_user_cached(db, user_id)
+        total_swaps = user_data.total_deals if user_data else 0
+
+        new_offer = Offer(
+            user_id=user_id,
+            offer_type=offer_type,
+            amount_sats=amount,
+            rate=1.0,
+            status='active',
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=OFFER_VISIBILITY_HOURS)
+        )
+        db.add(new_offer)
+        db.flush()  # Assigns the ID before the commit at the end of the block
+        return new_offer.id, total_swaps
 
-async def create_offer(query, user, amount, offer_type, db):
+async def create_offer(query, user, amount, offer_type):
     """
     Create new offer and publish to channel
     Steps 3-4 in flow: Offer created and published without showing username
     """
-    new_offer = Offer(
-        user_id=user.id,
-        offer_type=offer_type,
-        amount_sats=amount,
-        rate=1.0,
-        status='active',
-        expires_at=datetime.now(timezone.utc) + timedelta(hours=OFFER_VISIBILITY_HOURS)
-    )
-    
-    db.add(new_offer)
-    db.commit()
-    offer_id = new_offer.id
-    
-    # Get user statistics
-    user_data = db.query(User).filter(User.telegram_id == user.id).first()
-    total_swaps = user_data.total_deals
-    db.close()
+    offer_id, total_swaps = await run_db(_create_offer_db, user.id, amount, offer_type)
+    _user_cache.pop(user.id, None)  # User's data changed - /profile and button_handler reload it
     
     # Format amount for display
     amount_text = format_amount(amount)
     
-    if offer_type == "swapout":
-        success_message = f"""
-✅ Offer Created #{offer_id}
-
-Swap Out: Lightning → Bitcoin
-Amount: {amount_text} sats
-Completed swaps: {total_swaps}
-
-Your offer is live in @btcp2pswapoffers
-Relax and wait for someone to take it
-        """
-    else:
-        success_message = f"""
-✅ Offer Created #{offer_id}
-
-Swap In: Bitcoin → Lightning  
-Amount: {amount_text} sats
-Completed swaps: {total_swaps}
-
-Your offer is live in @btcp2pswapoffers
-Relax and wait for someone to take it
-        """
-    
-    await query.edit_message_text(success_message)
+    # Offer confirmation templates: MSG-037 (swapout) / MSG-038 (swapin)
+    success_message = msg.get_message(
+        'MSG-037' if offer_type == "swapout" else 'MSG-038',
+        offer_id=offer_id,
+        amount_text=amount_text,
+        total_swaps=total_swaps
+    )
     
-    # Publish to channel WITHOUT showing username (as required)
-    await post_to_channel(offer_id, total_swaps, amount, offer_type, amount_text)
+    # Confirm to the creator and publish to channel WITHOUT showing username (as required)
+    await asyncio.gather(
+        query.edit_message_text(success_message),
+        post_to_channel(query.get_bot(), offer_id, total_swaps, amount, offer_type, amount_text)
+    )
     
     logger.info(f"User {user.id} created {offer_type} offer: {amount} sats")
 
-async def post_to_channel(offer_id, total_swaps, amount, offer_type, amount_text):
+async def post_to_channel(bot, offer_id, total_swaps, amount, offer_type, amount_text):
     """
     Publish offer to public channel - WITHOUT showing creator's username
     Step 4 in flow: Publication without user @mention
+    Queued for channel_post_worker when it is running, so the button callback
+    does not wait for the Telegram round-trip
     """
     if not OFFERS_CHANNEL_ID:
         return
     
-    if offer_type == "swapout":
-        channel_message = f"""
-**Swap Out Offer #{offer_id}**
-
-**Offering:** {amount_text} sats Lightning
-**Seeking:** Bitcoin onchain  
-**User swaps:** {total_swaps}
-
-Activate this order sending the command /take {offer_id} to @btcp2pswapbot
-        """
-    else:
-        channel_message = f"""
-**Swap In Offer #{offer_id}**
-
-**Offering:** Bitcoin onchain
-**Seeking:** {amount_text} sats Lightning
-**User swaps:** {total_swaps}
-
-Activate this order sending the command /take {offer_id} to @btcp2pswapbot
-        """
+    # Channel post templates: MSG-058 (swapout) / MSG-059 (swapin)
+    channel_message = msg.get_message(
+        'MSG-058' if offer_type == "swapout" else 'MSG-059',
+        offer_id=offer_id,
+        amount_text=amount_text,
+        total_swaps=total_swaps
+    )
     
+    if channel_queue is not None:
+        channel_queue.put_nowait(channel_message.strip())
+        return
+
     try:
-        app = Application.builder().token(BOT_TOKEN).build()
-        await app.bot.send_message(
+        await bot.send_message(
             chat_id=OFFERS_CHANNEL_ID,
             text=channel_message,
             parse_mode='Markdown'
@@ -428,10 +531,101 @@ Activate this order sending the command /take {offer_id} to @btcp2pswapbot
     except Exception as e:
         logger.error(f"Failed to post to channel: {e}")
 
+async def channel_post_worker(bot):
+    """
+    Send queued channel posts, coalescing offers created within
+    CHANNEL_COALESCE_SECONDS of each other into a single message
+    """
+    loop = asyncio.get_running_loop()
+    pending = None
+
+    while True:
+        if pending is None:
+            pending = await channel_queue.get()
+        batch = [pending]
+        size = len(pending)
+        pending = None
+
+        # Collect more posts until the window closes or the message would be too long
+        deadline = loop.time() + CHANNEL_COALESCE_SECONDS
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                text = await asyncio.wait_for(channel_queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if size + len(text) + 2 > CHANNEL_MESSAGE_LIMIT:
+                pending = text
+                break
+            batch.append(text)
+            size += len(text) + 2
+
+        try:
+            await bot.send_message(
+                chat_id=OFFERS_CHANNEL_ID,
+                text="\n\n".join(batch),
+                parse_mode='Markdown'
+            )
+            logger.info(f"Posted {len(batch)} offer(s) to channel")
+        except Exception as e:
+            logger.error(f"Failed to post to channel: {e}")
+
 # =============================================================================
 # SECTION 4: TAKING OFFERS (/take) - STEPS 5-7 OF FLOW
 # =============================================================================
 
+def _take_offer_db(user, offer_id):
+    """
+    Database part of /take (runs in a worker thread)
+    Returns (error_text, (offer_type, amount_sats, deal_id))
+    """
+    error_text = None
+    taken = None
+
+    # One transaction: auto-registration, offer update and deal creation commit together
+    with session_scope() as db:
+        # Auto-register if doesn't exist
+        if register_user(db, user.id, user.username, user.first_name):
+            logger.info(f"Auto-registered user taking offer: {user.id}")
+
+        # Claim the offer atomically: only one of several racing takers gets a row back
+        now = datetime.now(timezone.utc)
+        claimed = db.execute(
+            update(Offer)
+            .where(Offer.id == offer_id, Offer.status == 'active', Offer.user_id != user.id)
+            .values(status='taken', taken_by=user.id, taken_at=now)
+            .returning(Offer.user_id, Offer.offer_type, Offer.amount_sats)
+        ).first()
+
+        if claimed is None:
+            # Nothing updated - find out why (only on the failure path)
+            owner_id = db.query(Offer.user_id).filter(
+                Offer.id == offer_id, Offer.status == 'active'
+            ).scalar()
+            if owner_id == user.id:
+                error_text = "❌ Cannot take your own offer"
+            else:
+                error_text = f"❌ Offer #{offer_id} not found or already taken"
+        else:
+            offer_user_id, offer_type, offer_amount = claimed
+
+            # Create deal with granular timeouts
+            new_deal = Deal(
+                offer_id=offer_id,
+                seller_id=offer_user_id if offer_type == 'swapout' else user.id,
+                buyer_id=user.id if offer_type == 'swapout' else offer_user_id,
+                amount_sats=offer_amount,
+                status='pending',
+                current_stage='pending',
+                stage_expires_at=now + timedelta(minutes=TXID_TIMEOUT_MINUTES),
+                offer_expires_at=now + timedelta(hours=OFFER_VISIBILITY_HOURS)
+            )
+
+            db.add(new_deal)
+            db.flush()
+            taken = (offer_type, offer_amount, new_deal.id)
+
+    return error_text, taken
+
 async def take(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Command /take - Carlos takes Ana's offer
@@ -449,66 +643,13 @@ async def take(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         await update.message.reply_text(msg.get_message('MSG-006'))
         return
     
-    db = get_db()
-    user_data = db.query(User).filter(User.telegram_id == user.id).first()
-    
-    if not user_data:
-        # Auto-register if doesn't exist
-        new_user = User(
-            telegram_id=user.id,
-            username=user.username,
-            first_name=user.first_name,
-            bitcoin_address="",
-            reputation_score=5.0,
-            total_deals=0,
-            total_volume=0
-        )
-        db.add(new_user)
-        db.commit()
-        logger.info(f"Auto-registered user taking offer: {user.id}")
-        user_data = new_user
-    
-    offer = db.query(Offer).filter(Offer.id == offer_id, Offer.status == 'active').first()
-    
-    if not offer:
-        db.close()
-        await update.message.reply_text(f"❌ Offer #{offer_id} not found or already taken")
-        return
-    
-    if offer.user_id == user.id:
-        db.close()
-        await update.message.reply_text("❌ Cannot take your own offer")
+    error_text, taken = await run_db(_take_offer_db, user, offer_id)
+
+    if error_text:
+        await update.message.reply_text(error_text)
         return
-    
-    # Get offer creator data
-    offer_creator = db.query(User).filter(User.telegram_id == offer.user_id).first()
-    
-    # Extract data BEFORE modifications to prevent DetachedInstanceError
-    offer_type = offer.offer_type
-    offer_amount = offer.amount_sats
-    creator_username = offer_creator.username if offer_creator else "Anonymous"
-    
-    # Mark offer as taken
-    offer.status = 'taken'
-    offer.taken_by = user.id
-    offer.taken_at = datetime.now(timezone.utc)
-    
-    # Create deal with granular timeouts
-    new_deal = Deal(
-        offer_id=offer.id,
-        seller_id=offer.user_id if offer_type == 'swapout' else user.id,
-        buyer_id=user.id if offer_type == 'swapout' else offer.user_id,
-        amount_sats=offer_amount,
-        status='pending',
-        current_stage='pending',
-        stage_expires_at=datetime.now(timezone.utc) + timedelta(minutes=TXID_TIMEOUT_MINUTES),
-        offer_expires_at=datetime.now(timezone.utc) + timedelta(hours=OFFER_VISIBILITY_HOURS)
-    )
-    
-    db.add(new_deal)
-    db.commit()
-    deal_id = new_deal.id
-    db.close()
+
+    offer_type, offer_amount, deal_id = taken
     
     # Format amount
     amount = offer_amount
@@ -525,28 +666,18 @@ async def take(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await update.message.reply_text(f"""
-🤝 Deal #{offer_id} Started
-
-Your role: Lightning Buyer ⚡
-You get: {amount_text} Lightning sats
-You pay: {amount_text} sats onchain
-
-⚠️ IMPORTANT WARNINGS:
-- Send EXACT amount or risk losing sats
-- This operation cannot be cancelled once started
-- Follow instructions carefully
-
-You have {TXID_TIMEOUT_MINUTES} minutes to accept and send TXID ⏱️
-        """, reply_markup=reply_markup)
+        await update.message.reply_text(
+            msg.get_message('MSG-009',
+                offer_id=offer_id,
+                amount_text=amount_text,
+                TXID_TIMEOUT_MINUTES=TXID_TIMEOUT_MINUTES
+            ),
+            reply_markup=reply_markup
+        )
         
     else:
         # Swap in - different flow (not fully implemented in your request)
-        await update.message.reply_text(f"""
-🤝 Deal #{offer_id} Started
-
-Swap in functionality - To be implemented
-        """)
+        await update.message.reply_text(msg.get_message('MSG-010', offer_id=offer_id))
 
     logger.info(f"User {user.id} took offer {offer_id}, deal {deal_id} created")
 
@@ -554,109 +685,125 @@ Swap in functionality - To be implemented
 # SECTION 5: DEAL ACCEPTANCE/CANCELLATION - STEPS 7-8 OF FLOW
 # =============================================================================
 
-async def accept_deal(query, user, deal_id, db):
+def _accept_deal_db(deal_id, buyer_id):
+    """
+    Database part of accept_deal (runs in a worker thread)
+    Returns (error_text, amount_sats)
+    """
+    with session_scope() as db:
+        deal = db.query(Deal).filter(Deal.id == deal_id, Deal.buyer_id == buyer_id).first()
+
+        if not deal:
+            return msg.get_message('MSG-011'), None
+
+        if deal.status != 'pending':
+            return msg.get_message('MSG-012', deal_id=deal_id), None
+
+        # Update deal state with timeouts
+        deal.status = 'accepted'
+        now = datetime.now(timezone.utc)
+        deal.accepted_at = now
+        deal.current_stage = 'txid_required'
+        deal.stage_expires_at = now + timedelta(minutes=TXID_TIMEOUT_MINUTES)
+        return None, deal.amount_sats
+
+async def accept_deal(query, user, deal_id):
     """
     Step 7 in flow: Carlos accepts - receives Bitcoin address and instructions
     """
-    deal = db.query(Deal).filter(Deal.id == deal_id, Deal.buyer_id == user.id).first()
-    
-    if not deal:
-        db.close()
-        await query.edit_message_text(msg.get_message('MSG-011'))
-        return
-    
-    if deal.status != 'pending':
-        db.close()
-        await query.edit_message_text(msg.get_message('MSG-012', deal_id=deal_id))
+    error_text, amount = await run_db(_accept_deal_db, deal_id, user.id)
+
+    if error_text:
+        await query.edit_message_text(error_text)
         return
-    
-    # Update deal state with timeouts
-    deal.status = 'accepted'
-    deal.accepted_at = datetime.now(timezone.utc)
-    deal.current_stage = 'txid_required'
-    deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(minutes=TXID_TIMEOUT_MINUTES)
-    db.commit()
+    _user_cache.pop(user.id, None)  # User's data changed - /profile and button_handler reload it
     
     # Get fixed address for this amount
-    fixed_address = FIXED_ADDRESSES.get(deal.amount_sats, "ADDRESS_NOT_CONFIGURED")
+    fixed_address = FIXED_ADDRESSES.get(amount, "ADDRESS_NOT_CONFIGURED")
     
     # Format amount
-    amount = deal.amount_sats
     amount_text = format_amount(amount)
     
-    db.close()
-    
-    # Step 7: First message with Bitcoin address
+    # Step 7: Deposit request, address and /txid instructions in one message
+    # The address stays in its own <code> line so it is still copied with one tap
     await query.edit_message_text(
-        msg.get_message('MSG-013', deal_id=deal_id, amount_text=amount_text), 
-        parse_mode='Markdown'
+        msg.get_message('MSG-013', deal_id=deal_id, amount_text=amount_text)
+        + msg.get_message('MSG-014', fixed_address=fixed_address)
+        + "\n\n"
+        + msg.get_message('MSG-015', amount_text=amount_text, TXID_TIMEOUT_MINUTES=TXID_TIMEOUT_MINUTES),
+        parse_mode='HTML'
     )
-    
-    # Send address separately for easy copying
-    await query.message.reply_text(
-        msg.get_message('MSG-014', fixed_address=fixed_address), 
-        parse_mode='Markdown'
-    )
-    
-    # Second message with /txid instructions
-    await query.message.reply_text(f"""
-Next step: Report your TXID
-
-Send {amount_text} sats to the address shared above and submit the transaction ID using /txid abc1234def567890
 
-Critical: Send the exact amount or risk losing your funds.
-
-You have {TXID_TIMEOUT_MINUTES} minutes to send TXID.
-
-Once the tx gets 3 confirmations you will receive a new message to send a Lightning Network invoice.
-    """)
+def _cancel_deal_db(deal_id, buyer_id):
+    """
+    Cancel the buyer's deal and reactivate (or expire) its offer (runs in a worker thread)
+    Returns the cancelled deal, or None if it is not found or not the buyer's
+    """
+    with session_scope() as db:
+        # Deal and its offer in a single query
+        row = db.query(Deal, Offer).outerjoin(
+            Offer, Offer.id == Deal.offer_id
+        ).filter(Deal.id == deal_id, Deal.buyer_id == buyer_id).first()
+        deal, offer = row if row else (None, None)
+        
+        if not deal:
+            return None
+        
+        # Cancel deal and reactivate offer
+        deal.status = 'cancelled'
+        deal.timeout_reason = 'User cancelled'
+        
+        if offer:
+            # Check if original 48-hour expiration time has passed
+            if offer.expires_at and datetime.now(timezone.utc) > offer.expires_at:
+                # Original time expired - mark as expired, DO NOT return to channel
+                offer.status = 'expired'
+                offer.taken_by = None
+                offer.taken_at = None
+                logger.info(f"Offer {offer.id} marked as expired - original 48h limit passed")
+            else:
+                # Still within 48h - return to channel with remaining time
+                offer.status = 'active'
+                offer.taken_by = None
+                offer.taken_at = None
+                # expires_at preserved - no reset of 48-hour timer
+                logger.info(f"Offer {offer.id} returned to channel with remaining time")
+        return deal
 
-async def cancel_deal(query, user, deal_id, db):
+async def cancel_deal(query, user, deal_id):
     """
     Step 8 alternative: Carlos cancels - offer returns to channel
     """
-    deal = db.query(Deal).filter(Deal.id == deal_id, Deal.buyer_id == user.id).first()
+    deal = await run_db(_cancel_deal_db, deal_id, user.id)
     
     if not deal:
-        db.close()
         await query.edit_message_text("❌ Deal not found or not yours")
         return
     
-    # Cancel deal and reactivate offer
-    deal.status = 'cancelled'
-    deal.timeout_reason = 'User cancelled'
-    
-    offer = db.query(Offer).filter(Offer.id == deal.offer_id).first()
-    if offer:
-        # Check if original 48-hour expiration time has passed
-        if offer.expires_at and datetime.now(timezone.utc) > offer.expires_at:
-            # Original time expired - mark as expired, DO NOT return to channel
-            offer.status = 'expired'
-            offer.taken_by = None
-            offer.taken_at = None
-            logger.info(f"Offer {offer.id} marked as expired - original 48h limit passed")
-        else:
-            # Still within 48h - return to channel with remaining time
-            offer.status = 'active'
-            offer.taken_by = None
-            offer.taken_at = None
-            # expires_at preserved - no reset of 48-hour timer
-            logger.info(f"Offer {offer.id} returned to channel with remaining time")
-    
-    db.commit()
-    db.close()
-    
-    await query.edit_message_text(f"""
-❌ Deal #{deal_id} Cancelled
-
-The offer is now available again in the channel.
-Others can take it with /take {deal.offer_id}
-    """)
+    # Single edit carries both the result and the /take instruction
+    await query.edit_message_text(msg.get_message('MSG-017', deal_id=deal_id, deal=deal))
 
 # =============================================================================
 # SECTION 6: TRANSACTION REPORTING (/txid) - STEP 8 OF FLOW
 # =============================================================================
 
+def _find_txid_deal(buyer_id):
+    """Deal waiting for the buyer's TXID (runs in a worker thread)"""
+    with session_scope() as db:
+        return db.query(Deal).filter(
+            Deal.buyer_id == buyer_id,
+            Deal.status.in_(TXID_DEAL_STATUSES)
+        ).first()
+
+def _record_txid(deal_id, txid):
+    """Store the reported TXID and start the confirmation stage (runs in a worker thread)"""
+    with session_scope() as db:
+        deal = db.query(Deal).filter(Deal.id == deal_id).first()
+        deal.buyer_bitcoin_txid = txid
+        deal.status = 'bitcoin_sent'
+        deal.current_stage = 'confirming_bitcoin'
+        deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=BITCOIN_CONFIRMATION_HOURS)
+
 async def txid_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Command /txid - Carlos reports Bitcoin transaction
@@ -676,7 +823,7 @@ async def txid_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         await update.message.reply_text(msg.get_message('MSG-018'))
         return
 
-    txid = context.args[0].strip()
+    txid = context.args[0].strip().lower()
 
     # Log TXID submission (filtered)
     swap_logger.log_user_interaction(
@@ -684,33 +831,30 @@ async def txid_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         action='txid_submission',
         details=f'txid={txid[:8]}...' if txid else 'empty_txid'
     )
+
+    # TXID format validation - rejected before any DB or blockchain API work
+    if not TXID_RE.match(txid):
+        await update.message.reply_text(msg.get_message('MSG-018b'))
+        return
     
     # Find active deal for this user
-    db = get_db()
-    deal = db.query(Deal).filter(
-        Deal.buyer_id == user.id,
-        Deal.status.in_(['accepted', 'bitcoin_sent'])
-    ).first()
+    deal = await run_db(_find_txid_deal, user.id)
     
     if not deal:
-        db.close()
         await update.message.reply_text(msg.get_message('MSG-019'))
         return
 
     # Get fixed address for this deal amount
     fixed_address = FIXED_ADDRESSES.get(deal.amount_sats, "ADDRESS_NOT_CONFIGURED")
     if fixed_address == "ADDRESS_NOT_CONFIGURED":
-        db.close()
         await update.message.reply_text(msg.get_message('MSG-019b'))
         return
 
     # Verify the Bitcoin transaction on blockchain
     try:
-        from bitcoin_utils import verify_payment
-        verification_result = verify_payment(fixed_address, deal.amount_sats, txid)
+        verification_result = await verify_payment_async(fixed_address, deal.amount_sats, txid)
 
         if not verification_result.get('found', False):
-            db.close()
             await update.message.reply_text(
                 msg.get_message('MSG-019c',
                     error=verification_result.get('error', 'Payment not found')),
@@ -724,29 +868,22 @@ async def txid_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     except Exception as e:
         logger.error(f"Error verifying Bitcoin transaction {txid}: {e}")
-        db.close()
         await update.message.reply_text(msg.get_message('MSG-019d'))
         return
 
     # Update deal with TXID and timeouts
-    deal.buyer_bitcoin_txid = txid
-    deal.status = 'bitcoin_sent'
-    deal.current_stage = 'confirming_bitcoin'
-    deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=BITCOIN_CONFIRMATION_HOURS)
-    db.commit()
+    await run_db(_record_txid, deal.id, txid)
+    wake_job(monitor_confirmations)
     
     # Format amount
     amount = deal.amount_sats
     amount_text = format_amount(amount)
     
-    db.close()
-    
     await update.message.reply_text(
         msg.get_message('MSG-020',
                        deal=deal,
                        amount_text=amount_text,
-                       CONFIRMATION_COUNT=CONFIRMATION_COUNT),
-        parse_mode='Markdown'
+                       CONFIRMATION_COUNT=CONFIRMATION_COUNT)
     )
     
     logger.info(f"User {user.id} reported TXID {txid} for deal {deal.id}")
@@ -755,6 +892,36 @@ async def txid_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 # SECTION 7: LIGHTNING INVOICE (/invoice) - STEPS 9-10 OF FLOW
 # =============================================================================
 
+def _find_invoice_deal(buyer_id):
+    """Buyer's deal waiting for a Lightning invoice (runs in a worker thread)"""
+    with get_db() as db:
+        return db.query(Deal).filter(
+            Deal.buyer_id == buyer_id,
+            Deal.status == 'bitcoin_confirmed'
+        ).first()
+
+def _store_invoice_db(deal_id, invoice, payment_hash, wrapped_invoice):
+    """
+    Save the buyer's invoice after the lnproxy attempts (runs in a worker thread)
+    With a wrapped invoice the deal moves to payment; without one it waits for the privacy decision
+    Returns the updated deal, or None if it left 'bitcoin_confirmed' meanwhile (e.g. timed out)
+    """
+    with session_scope() as db:
+        deal = db.query(Deal).filter(Deal.id == deal_id, Deal.status == 'bitcoin_confirmed').first()
+        if not deal:
+            return None
+
+        deal.payment_hash = payment_hash
+        if wrapped_invoice:
+            deal.lightning_invoice = wrapped_invoice
+            deal.status = 'lightning_invoice_received'
+            deal.current_stage = 'payment_required'
+            deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=LIGHTNING_PAYMENT_HOURS)
+        else:
+            deal.lightning_invoice = invoice  # Save original invoice temporarily
+            deal.status = 'awaiting_privacy_decision'
+        return deal
+
 async def invoice_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Command /invoice - Carlos provides Lightning invoice
@@ -771,12 +938,12 @@ async def invoice_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     if not context.args:
         await update.message.reply_text(
-            msg.get_message('MSG-022'),
-            parse_mode='Markdown'
+            msg.get_message('MSG-022')
         )
         return
 
-    invoice = ' '.join(context.args).strip()
+    # Users often paste invoices wrapped over several lines
+    invoice = ''.join(''.join(context.args).split())
 
     # Log invoice submission (filtered)
     swap_logger.log_user_interaction(
@@ -785,48 +952,42 @@ async def invoice_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         details=f'invoice={invoice[:10]}...' if invoice else 'empty_invoice'
     )
 
-    # Basic invoice validation
-    if not invoice.startswith(('lnbc', 'lntb', 'lnbcrt')):
+    # Invoice format validation - rejected before any DB or LND work
+    invoice_match = LN_INVOICE_RE.match(invoice)
+    if not invoice_match:
         await update.message.reply_text(
-            msg.get_message('MSG-023'),
-            parse_mode='Markdown'
+            msg.get_message('MSG-023')
         )
         return
 
     # Network validation - reject mainnet invoices (lnbc but not lnbcrt)
-    if invoice.startswith('lnbc') and not invoice.startswith('lnbcrt'):
+    if invoice_match.group(1).lower() == 'bc':
         await update.message.reply_text(
-            msg.get_message('MSG-023b'),
-            parse_mode='Markdown'
+            msg.get_message('MSG-023b')
         )
         return
     
-    # Find deal waiting for invoice
-    db = get_db()
-    deal = db.query(Deal).filter(
-        Deal.buyer_id == user.id,
-        Deal.status == 'bitcoin_confirmed'
-    ).first()
+    # Find deal waiting for invoice - no session is held during the LND and lnproxy calls below
+    deal = await run_db(_find_invoice_deal, user.id)
     
     if not deal:
-        db.close()
         await update.message.reply_text(
-            msg.get_message('MSG-024'),
-            parse_mode='Markdown'
+            msg.get_message('MSG-024')
         )
         return
     
-    # Extract payment hash from invoice
-    try:
-        from bitcoin_utils import extract_payment_hash_from_invoice
-        payment_hash = extract_payment_hash_from_invoice(invoice) or "hash_placeholder"
-    except:
-        payment_hash = "hash_placeholder"
+    # Extract payment hash from invoice (returns None and logs if LND can't decode it)
+    payment_hash = await asyncio.to_thread(extract_payment_hash_from_invoice, invoice)
+    if not payment_hash:
+        # A placeholder hash could never be verified - ask for the invoice again
+        await update.message.reply_text(
+            msg.get_message('MSG-023c')
+        )
+        return
 
     # Notify Carlos that we're processing privacy enhancement
     await update.message.reply_text(
-        msg.get_message('MSG-025', deal=deal),
-        parse_mode='Markdown'
+        msg.get_message('MSG-025', deal=deal)
     )
     
     # Attempt lnproxy wrapping - Multiple attempts with timeout
@@ -834,9 +995,6 @@ async def invoice_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     lnproxy_success = False
     
     try:
-        from lnproxy_utils import wrap_invoice_for_privacy
-        import time
-        
         # Maximum 3 attempts in 5 minutes
         max_attempts = 3
         timeout_minutes = 5
@@ -850,7 +1008,7 @@ async def invoice_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 break
                 
             logger.info(f'lnproxy attempt {attempt + 1}/{max_attempts}')
-            success, result = wrap_invoice_for_privacy(invoice)
+            success, result = await asyncio.to_thread(wrap_invoice_for_privacy, invoice)
             
             if success and result.get('wrapped_invoice'):
                 final_invoice = result['wrapped_invoice']
@@ -860,75 +1018,74 @@ async def invoice_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             else:
                 logger.warning(f'lnproxy attempt {attempt + 1} failed: {result.get("error", "unknown")}')
                 if attempt < max_attempts - 1:
-                    time.sleep(30)  # Wait 30 seconds between attempts
+                    await asyncio.sleep(30)  # Wait 30 seconds between attempts
                     
     except Exception as e:
         logger.error(f'lnproxy error: {e}')
     
+    # Save the result in one short write
+    deal = await run_db(_store_invoice_db, deal.id, invoice, payment_hash, final_invoice if lnproxy_success else None)
+    if not deal:
+        await update.message.reply_text(
+            msg.get_message('MSG-024')
+        )
+        return
+    
     # Check lnproxy result
     if lnproxy_success:
         # lnproxy worked - proceed normally
-        deal.lightning_invoice = final_invoice
-        deal.payment_hash = payment_hash
-        deal.status = 'lightning_invoice_received'
-        deal.current_stage = 'payment_required'
-        deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=LIGHTNING_PAYMENT_HOURS)
-        db.commit()
-        
-        seller_id = deal.seller_id
-        
         # Format amount
         amount = deal.amount_sats
         amount_text = format_amount(amount)
-        
-        db.close()
 
-        # Notify Carlos of successful privacy enhancement
-        await update.message.reply_text(
-            msg.get_message('MSG-026',
-                deal=deal,
-                invoice=final_invoice,
-                amount_text=amount_text,
-                LIGHTNING_PAYMENT_HOURS=LIGHTNING_PAYMENT_HOURS
+        # Notify Carlos of successful privacy enhancement (step 10: wait for payment)
+        # and, concurrently, check if Ana should be notified
+        await asyncio.gather(
+            update.message.reply_text(
+                msg.get_message('MSG-026',
+                    deal=deal,
+                    invoice_preview=invoice[:20],
+                    amount_text=amount_text,
+                    LIGHTNING_PAYMENT_HOURS=LIGHTNING_PAYMENT_HOURS
+                ),
+                parse_mode='HTML'
             ),
-            parse_mode='Markdown'
+            check_and_notify_ana(deal.id)
         )
-
-        # Call coordinated function to check if Ana should be notified
-        await check_and_notify_ana(deal.id)
         
     else:
         # lnproxy failed - show decision UI to Carlos
-        deal.status = 'awaiting_privacy_decision'
-        deal.lightning_invoice = invoice  # Save original invoice temporarily
-        deal.payment_hash = payment_hash
-        db.commit()
-        db.close()
-        
         await handle_lnproxy_failure(update, deal.id, invoice)
         return  # Exit - wait for Carlos's decision
-    
-    # Step 10: Notify Carlos to wait for payment
-    await update.message.reply_text(f"""
-⚡ Invoice Received - Deal #{deal.id}
-
-Status: Payment request sent to seller
-Your invoice: `{invoice[:20]}...`
-Amount: {amount_text} sats
-
-The seller will pay your Lightning invoice.
-Bot will verify payment and complete the swap.
-
-Time limit: {LIGHTNING_PAYMENT_HOURS} hours ⏰
-    """, parse_mode='Markdown')
-    
-    # Call coordinated function to check if Ana should be notified
-    await check_and_notify_ana(deal.id)
 
 # =============================================================================
 # SECTION 8: BITCOIN ADDRESS (/address) - STEPS 11-12 OF FLOW
 # =============================================================================
 
+def _save_address_db(seller_id, address):
+    """
+    Save the seller's payout address (runs in a worker thread)
+    If the buyer's invoice is already stored the deal goes straight to 'lightning_payment_pending'
+    Returns the updated deal, or None if no deal is waiting for an address
+    """
+    with session_scope() as db:
+        deal = db.query(Deal).filter(
+            Deal.seller_id == seller_id,
+            Deal.status == 'awaiting_bitcoin_address',
+            Deal.seller_bitcoin_address.is_(None)
+        ).first()
+        if not deal:
+            return None
+
+        deal.seller_bitcoin_address = address
+        if deal.lightning_invoice:
+            # Ana receives the invoice right away - wait for her Lightning payment
+            deal.status = 'lightning_payment_pending'
+            deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=2)
+        else:
+            deal.status = 'address_provided_awaiting_payment'
+        return deal
+
 async def address_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Command /address - Ana provides Bitcoin address and receives Lightning invoice
@@ -944,11 +1101,7 @@ async def address_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     )
 
     if not context.args:
-        await update.message.reply_text("""
-❌ Usage: /address [bitcoin_address]
-
-Example: /address tb1q...
-        """)
+        await update.message.reply_text(msg.get_message('MSG-040'))
         return
 
     address = context.args[0].strip()
@@ -961,102 +1114,87 @@ Example: /address tb1q...
     )
 
     # Validate Bitcoin address
-    try:
-        from bitcoin_utils import validate_bitcoin_address
-        if not validate_bitcoin_address(address):
-            await update.message.reply_text("❌ Invalid Bitcoin address format")
-            return
-    except ImportError:
-        # If no bitcoin_utils, basic validation
-        if not (address.startswith(('tb1', 'bc1', '1', '3')) and len(address) >= 26):
-            await update.message.reply_text("❌ Invalid Bitcoin address format")
-            return
+    if not validate_bitcoin_address(address):
+        await update.message.reply_text(msg.get_message('MSG-041'))
+        return
     
-    # Find deal waiting for Bitcoin address
-    db = get_db()
-    deal = db.query(Deal).filter(
-        Deal.seller_id == user.id,
-        Deal.status == 'awaiting_bitcoin_address',
-        Deal.seller_bitcoin_address.is_(None)
-    ).first()
+    # Find deal waiting for Bitcoin address and save it in one short write
+    deal = await run_db(_save_address_db, user.id, address)
     
     if not deal:
-        db.close()
-        await update.message.reply_text("❌ No deal found waiting for Bitcoin address")
+        await update.message.reply_text(msg.get_message('MSG-042'))
         return
     
-    # Save Bitcoin address
-    deal.seller_bitcoin_address = address
-    deal.status = 'address_provided_awaiting_payment'
-    db.commit()
-    
     amount = deal.amount_sats
     amount_text = format_amount(amount)
     
     # Confirm address was saved
-    await update.message.reply_text(f"""
-✅ Bitcoin Address Saved - Deal #{deal.id}
-
-Address: `{address}`
-Amount: {amount_text} sats
-
-Now please pay the Lightning invoice below:
-    """, parse_mode='Markdown')
+    await update.message.reply_text(
+        msg.get_message('MSG-043', deal=deal, address=address, amount_text=amount_text),
+        parse_mode='HTML'
+    )
     
-    # NEW: Send Lightning invoice to Ana for payment
+    # NEW: Send Lightning invoice to Ana for payment (deal is already 'lightning_payment_pending')
     if deal.lightning_invoice:
-        invoice_message = f"""
-⚡ Lightning Payment Required
-
-Pay this invoice to complete your swap:
-
-`{deal.lightning_invoice}`
-
-Amount: {amount_text} sats
-Time limit: 2 hours
-
-After payment verification, your Bitcoin will be sent in the next batch.
-        """
-        
-        await update.message.reply_text(invoice_message, parse_mode='Markdown')
-        
-        # Change status to indicate we're waiting for Lightning payment
-        deal.status = 'lightning_payment_pending'
-        deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=2)
-        db.commit()
+        await update.message.reply_text(
+            msg.get_message('MSG-044', deal=deal, amount_text=amount_text),
+            parse_mode='HTML'
+        )
+        wake_job(monitor_lightning_payments)
         
         logger.info(f"Deal {deal.id}: Lightning invoice sent to Ana after address provided")
     else:
-        await update.message.reply_text("❌ Lightning invoice not available. Please contact support.")
+        await update.message.reply_text(msg.get_message('MSG-045'))
         logger.error(f"Deal {deal.id}: No lightning_invoice found when Ana provided address")
-    
-    db.close()
 
 # =============================================================================
 # SECTION 9: QUERY COMMANDS (/offers, /deals)
 # =============================================================================
 
+def _load_user_offers_db(user_id):
+    """
+    User's offers and the first deal of each (runs in a worker thread)
+    Returns (user_offers, deal_by_offer)
+    """
+    with get_db() as db:
+        # Offers with their deals in one LEFT JOIN (deal is None for untaken offers)
+        rows = db.query(Offer, Deal).outerjoin(
+            Deal, Deal.offer_id == Offer.id
+        ).filter(Offer.user_id == user_id).order_by(Offer.id, Deal.id).all()
+    
+    # A reactivated offer can have several deals - keep the first one, as before
+    user_offers = []
+    deal_by_offer = {}
+    for offer, deal in rows:
+        if offer.id not in deal_by_offer:
+            user_offers.append(offer)
+            deal_by_offer[offer.id] = deal
+    
+    return user_offers, deal_by_offer
+
+# Progress shown in /offers for a taken offer, by deal status
+_OFFER_DEAL_STATUS = {
+    'pending': "🟡 Taken - Awaiting acceptance",
+    'accepted': "🟡 In progress - Bitcoin deposit needed",
+    'bitcoin_sent': "🟡 In progress - Waiting confirmations",
+    'bitcoin_confirmed': "🟡 In progress - Lightning setup",
+    'lightning_invoice_received': "🟡 In progress - Lightning payment pending",
+    'awaiting_bitcoin_address': "🟡 Almost done - Provide Bitcoin address",
+    'ready_for_batch': "🟠 In batch queue - Payment processing",
+    'completed': "🟢 Completed"
+}
+
 async def offers(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """View user offers with detailed status"""
     user = update.effective_user
     
-    db = get_db()
-    user_offers = db.query(Offer).filter(Offer.user_id == user.id).all()
+    user_offers, deal_by_offer = await run_db(_load_user_offers_db, user.id)
     
     if not user_offers:
-        await update.message.reply_text("""
-📋 No offers yet
-
-Create one:
-/swapout - Lightning ⚡ → Bitcoin ₿
-/swapin - Bitcoin ₿ → Lightning ⚡
-
-Channel: @btcp2pswapoffers
-        """)
-        db.close()
+        await update.message.reply_text(msg.get_message('MSG-048'))
         return
     
-    message = "📋 Your Offers\n\n"
+    parts = ["📋 Your Offers\n\n"]
     
     for offer in user_offers:
         # Format amount
@@ -1072,65 +1210,68 @@ Channel: @btcp2pswapoffers
             offer_desc = f"Buying {amount_text} Lightning"
         
         # Get deal state if offer was taken
-        deal = db.query(Deal).filter(Deal.offer_id == offer.id).first()
+        deal = deal_by_offer.get(offer.id)
         
         if offer.status == 'active':
             status_info = "🟢 Active - Waiting for taker"
         elif offer.status == 'taken' and deal:
-            if deal.status == 'pending':
-                status_info = "🟡 Taken - Awaiting acceptance"
-            elif deal.status == 'accepted':
-                status_info = "🟡 In progress - Bitcoin deposit needed"
-            elif deal.status == 'bitcoin_sent':
-                status_info = "🟡 In progress - Waiting confirmations"
-            elif deal.status == 'bitcoin_confirmed':
-                status_info = "🟡 In progress - Lightning setup"
-            elif deal.status == 'lightning_invoice_received':
-                status_info = "🟡 In progress - Lightning payment pending"
-            elif deal.status == 'awaiting_bitcoin_address':
-                status_info = "🟡 Almost done - Provide Bitcoin address"
-            elif deal.status == 'ready_for_batch':
-                status_info = "🟠 In batch queue - Payment processing"
-            elif deal.status == 'completed':
-                status_info = "🟢 Completed"
-            else:
-                status_info = f"🟡 Status: {deal.status}"
+            status_info = _OFFER_DEAL_STATUS.get(deal.status) or f"🟡 Status: {deal.status}"
         else:
             status_info = f"⚪ {offer.status.title()}"
         
-        message += f"#{offer.id} - {direction} {amount_text} sats\n"
-        message += f"{offer_desc}\n"
-        message += f"{status_info}\n\n"
+        parts.append(f"#{offer.id} - {direction} {amount_text} sats\n{offer_desc}\n{status_info}\n\n")
     
-    message += f"Total: {len(user_offers)} offers"
+    parts.append(f"Total: {len(user_offers)} offers")
     
-    db.close()
-    await update.message.reply_text(message)
+    await update.message.reply_text("".join(parts))
 
-async def deals(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """View user's active deals"""
+# Status emoji and label shown for each deal in /deals
+_STATUS_EMOJI = {
+    'pending': '⏳',
+    'accepted': '✅',
+    'bitcoin_sent': '💸',
+    'bitcoin_confirmed': '🔄',
+    'lightning_invoice_received': '⚡'
+}
+
+_STATUS_LABEL = {
+    'pending': 'Pending',
+    'accepted': 'Accepted',
+    'bitcoin_sent': 'Bitcoin Sent',
+    'bitcoin_confirmed': 'Bitcoin Confirmed',
+    'lightning_invoice_received': 'Lightning Invoice Received'
+}
+
+def _load_active_deals_db(user_id):
+    """Active deals where the user is buyer or seller (runs in a worker thread)"""
+    with get_db() as db:
+        return db.query(Deal).filter(
+            (Deal.seller_id == user_id) | (Deal.buyer_id == user_id),
+            Deal.status.in_(ACTIVE_DEAL_STATUSES)
+        ).all()
+
+async def deals(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """View user's active deals"""
     user = update.effective_user
     
-    db = get_db()
-    user_deals = db.query(Deal).filter(
-        (Deal.seller_id == user.id) | (Deal.buyer_id == user.id),
-        Deal.status.in_(['pending', 'accepted', 'bitcoin_sent', 'bitcoin_confirmed', 'lightning_invoice_received'])
-    ).all()
+    user_deals = await run_db(_load_active_deals_db, user.id)
     
     if not user_deals:
-        await update.message.reply_text("""
-📋 No active deals
-
-Create offers:
-/swapout - Lightning ⚡ → Bitcoin ₿
-/swapin - Bitcoin ₿ → Lightning ⚡
-
-Browse: /offers
-        """, parse_mode='Markdown')
-        db.close()
+        await update.message.reply_text(msg.get_message('MSG-050'))
         return
     
-    message = "📋 Your Active Deals\n\n"
+    # Confirmations for every deal waiting on Bitcoin, fetched once before rendering
+    pending_txids = [deal.buyer_bitcoin_txid for deal in user_deals
+                     if deal.status == 'bitcoin_sent' and deal.buyer_bitcoin_txid]
+    confirmations_by_txid = {}
+    if pending_txids:
+        try:
+            confirmations_by_txid = await get_confirmations_batch_async(pending_txids)
+        except Exception as e:
+            logger.error(f"Error getting confirmations for /deals: {e}")
+    
+    parts = ["📋 Your Active Deals\n\n"]
+    now = datetime.now(timezone.utc)
     
     for deal in user_deals:
         # Format amount
@@ -1145,33 +1286,25 @@ Browse: /offers
             role = "Buyer (Bitcoin)"
             direction = "₿→⚡"
         
-        status_emoji = {
-            'pending': '⏳',
-            'accepted': '✅',
-            'bitcoin_sent': '💸',
-            'bitcoin_confirmed': '🔄',
-            'lightning_invoice_received': '⚡'
-        }.get(deal.status, '❓')
+        status_emoji = _STATUS_EMOJI.get(deal.status, '❓')
         
-        message += f"#{deal.id} - {direction} {amount_text} sats\n"
-        message += f"Role: {role}\n"
+        parts.append(f"#{deal.id} - {direction} {amount_text} sats\nRole: {role}\n")
         
         # Add real-time confirmation checking and timeout info
-        status_text = deal.status.replace('_', ' ').title()
+        status_text = _STATUS_LABEL.get(deal.status, deal.status)
         if deal.status == 'bitcoin_sent' and deal.buyer_bitcoin_txid:
-            try:
-                from bitcoin_utils import get_confirmations
-                current_confirmations = get_confirmations(deal.buyer_bitcoin_txid)
+            current_confirmations = confirmations_by_txid.get(deal.buyer_bitcoin_txid)
+            if current_confirmations is not None:
                 status_text = f"Bitcoin Sent ({current_confirmations}/3 confirmations)"
                 if current_confirmations < 3:
                     remaining = 3 - current_confirmations
                     status_text += f"\nNext: Waiting {remaining} more confirmation{'s' if remaining != 1 else ''}"
-            except Exception:
+            else:
                 status_text = "Bitcoin Sent (checking confirmations...)"
         
         # Add timeout information
-        if deal.stage_expires_at and deal.stage_expires_at > datetime.now(timezone.utc):
-            time_left = deal.stage_expires_at - datetime.now(timezone.utc)
+        if deal.stage_expires_at and deal.stage_expires_at > now:
+            time_left = deal.stage_expires_at - now
             if time_left.total_seconds() > 3600:  # More than 1 hour
                 hours_left = int(time_left.total_seconds() / 3600)
                 status_text += f"\nTimeout: {hours_left}h remaining"
@@ -1179,267 +1312,352 @@ Browse: /offers
                 minutes_left = int(time_left.total_seconds() / 60)
                 status_text += f"\nTimeout: {minutes_left}m remaining"
         
-        message += f"Status: {status_text} {status_emoji}\n\n"
+        parts.append(f"Status: {status_text} {status_emoji}\n\n")
     
-    db.close()
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text("".join(parts))
 
 # =============================================================================
 # SECTION 10: BACKGROUND MONITORING - AUTOMATED PROCESSES
 # =============================================================================
 
+def _mark_awaiting_address_db(deal_id):
+    """
+    Move a deal to 'awaiting_bitcoin_address' once Bitcoin is confirmed and the invoice is ready
+    (runs in a worker thread). One guarded UPDATE ... RETURNING: returns the deal, or None if
+    either condition is still missing
+    """
+    with session_scope() as db:
+        return db.scalars(
+            update(Deal)
+            .where(
+                Deal.id == deal_id,
+                or_(Deal.status == 'bitcoin_confirmed', Deal.bitcoin_confirmations >= CONFIRMATION_COUNT),
+                Deal.lightning_invoice.isnot(None)
+            )
+            .values(status='awaiting_bitcoin_address')
+            .returning(Deal)
+        ).first()
+
 async def check_and_notify_ana(deal_id):
     """
     Check if Ana should be notified: Bitcoin confirmed + invoice ready
     Implements coordinated timing according to Issue #25
     """
     try:
-        db = get_db()
-        deal = db.query(Deal).filter(Deal.id == deal_id).first()
+        # Check both conditions and change status to indicate we're waiting for address
+        deal = await run_db(_mark_awaiting_address_db, deal_id)
         
         if not deal:
-            db.close()
+            logger.info(f"Deal {deal_id}: Waiting - Bitcoin confirmation or Lightning invoice still missing")
             return False
         
-        # Check both conditions
-        bitcoin_confirmed = (deal.status == 'bitcoin_confirmed' or 
-                            deal.bitcoin_confirmations >= CONFIRMATION_COUNT)
-        invoice_ready = deal.lightning_invoice is not None
+        # Both conditions met - request Bitcoin address from Ana
+        amount_text = format_amount(deal.amount_sats)
         
-        if bitcoin_confirmed and invoice_ready:
-            # Both conditions met - request Bitcoin address from Ana
-            seller_id = deal.seller_id
-            amount_text = format_amount(deal.amount_sats)
-            
-            # Change status to indicate we're waiting for address
-            deal.status = 'awaiting_bitcoin_address'
-            db.commit()
-            
-            app = Application.builder().token(BOT_TOKEN).build()
-            
-            address_request_message = f"""
-Bitcoin Confirmed - Deal #{deal.id}
-
-Bitcoin deposit confirmed: {amount_text} sats
-Status: Ready for final step
-
-IMPORTANT: Provide your Bitcoin address first
-After you send your address, the Lightning invoice will be revealed to complete the swap.
-
-Send: /address [your_bitcoin_address]
-Time limit: 48 hours
-
-Your funds are secured and this step ensures smooth completion.
-            """
-            
-            await app.bot.send_message(
-                chat_id=seller_id,
-                text=address_request_message
-            )
-            
-            logger.info(f"Ana notified for address request - deal {deal_id}")
-            db.close()
-            return True
-        else:
-            logger.info(f"Deal {deal_id}: Waiting - Bitcoin confirmed: {bitcoin_confirmed}, Invoice ready: {invoice_ready}")
-            db.close()
-            return False
+        await get_bot().send_message(
+            chat_id=deal.seller_id,
+            text=msg.get_message('MSG-039', deal=deal, amount_text=amount_text)
+        )
+        
+        logger.info(f"Ana notified for address request - deal {deal_id}")
+        return True
             
     except Exception as e:
         logger.error(f"Error in check_and_notify_ana: {e}")
         return False
 
+def _load_confirming_deals_db():
+    """Deals waiting for Bitcoin confirmations as (id, txid) rows (runs in a worker thread)"""
+    with get_db() as db:
+        # Only the columns needed to check them, served by ix_deals_status_stage_expires
+        return db.execute(
+            select(Deal.id, Deal.buyer_bitcoin_txid).where(
+                Deal.status == 'bitcoin_sent',
+                Deal.current_stage == 'confirming_bitcoin',
+                Deal.stage_expires_at > datetime.now(timezone.utc),
+                Deal.buyer_bitcoin_txid.isnot(None)
+            )
+        ).all()
+
+def _confirm_bitcoin_db(deal_ids):
+    """
+    Move confirmed deals to the invoice stage with one UPDATE (runs in a worker thread)
+    Returns the updated deals for notification
+    """
+    with session_scope() as db:
+        return db.scalars(
+            update(Deal)
+            .where(Deal.id.in_(deal_ids), Deal.status == 'bitcoin_sent')
+            .values(
+                status='bitcoin_confirmed',
+                current_stage='invoice_required',
+                stage_expires_at=datetime.now(timezone.utc) + timedelta(hours=LIGHTNING_INVOICE_HOURS)
+            )
+            .returning(Deal)
+        ).all()
+
 async def monitor_confirmations():
     """
     Monitor Bitcoin confirmations - Step 8 of flow
     Detects when Carlos has 3 confirmations and requests Lightning invoice
+
+    Confirmations only change when a block is mined, so each deal is checked
+    once per new tip height instead of on a fixed timer
+    One pass - returns seconds until the next pass (run by scheduler)
     """
-    while True:
-        try:
-            db = get_db()
-            
-            # Find deals waiting for confirmations
-            pending_deals = db.query(Deal).filter(
-                Deal.current_stage == 'confirming_bitcoin',
-                Deal.buyer_bitcoin_txid.isnot(None),
-                Deal.stage_expires_at > datetime.now(timezone.utc)
-            ).all()
-            
-            for deal in pending_deals:
-                txid = deal.buyer_bitcoin_txid
-                
-                # Import bitcoin functions
-                try:
-                    from bitcoin_utils import get_confirmations
-                except ImportError as e:
-                    logger.error(f"Failed to import get_confirmations: {e}")
-                    continue
-                
-                confirmations = get_confirmations(txid)
-                logger.info(f"Deal {deal.id}: TXID {txid} has {confirmations} confirmations")
-                
-                if confirmations >= CONFIRMATION_COUNT:
-                    # Update deal state
-                    deal.status = 'bitcoin_confirmed'
-                    deal.current_stage = 'invoice_required'
-                    deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=LIGHTNING_INVOICE_HOURS)
-                    db.commit()
-                    
-                    logger.info(f"Deal {deal.id}: Bitcoin confirmed! Requesting Lightning invoice")
-                    # Also check if Ana can be notified
-                    await check_and_notify_ana(deal.id)                    
-                    # Notify Carlos to provide Lightning invoice
-                    app = Application.builder().token(BOT_TOKEN).build()
-                    
-                    amount = deal.amount_sats
-                    amount_text = format_amount(amount)
-                    
-                    await app.bot.send_message(
-                        chat_id=deal.buyer_id,
-                        text=msg.get_message('MSG-021', deal=deal, amount_text=amount_text),
-                        parse_mode='Markdown'
-                    )
-            
-            db.close()
-            
-        except Exception as e:
-            logger.error(f"Error in monitor_confirmations: {e}")
+    global _confirmations_checked_at_tip
+    checked_at_tip = _confirmations_checked_at_tip
+
+    tip_height = None
+    try:
+        # Short read - no session is held during the explorer and Telegram calls below
+        pending_deals = await run_db(_load_confirming_deals_db)
+        if not pending_deals:
+            # Nothing to confirm - /txid wakes this job when a deal enters the stage
+            _confirmations_checked_at_tip.clear()
+            return IDLE_CHECK_SECONDS
+
+        tip_height = await asyncio.to_thread(get_tip_height)
+        
+        # Forget deals that are no longer waiting for confirmations
+        pending_ids = {deal_id for deal_id, _ in pending_deals}
+        checked_at_tip = _confirmations_checked_at_tip = {
+            deal_id: tip for deal_id, tip in checked_at_tip.items() if deal_id in pending_ids
+        }
+
+        # Nothing can have changed for deals already checked at this height
+        to_check = [(deal_id, txid) for deal_id, txid in pending_deals
+                    if tip_height is None or checked_at_tip.get(deal_id) != tip_height]
+
+        # One tip read for the whole pass; txids whose block is already known are computed locally
+        confirmations_by_txid = {}
+        if to_check:
+            confirmations_by_txid = await get_confirmations_batch_async([txid for _, txid in to_check])
+
+        confirmed_ids = []
+        for deal_id, txid in to_check:
+            confirmations = confirmations_by_txid.get(txid)
+            if confirmations is None:
+                # Lookup failed - leave the deal unmarked so the next pass retries it
+                logger.warning(f"Deal {deal_id}: could not fetch confirmations for TXID {txid}")
+                continue
+            checked_at_tip[deal_id] = tip_height
         
-        # Check every 10 minutes as configured
-        await asyncio.sleep(CONFIRMATION_CHECK_MINUTES * 60)
+            logger.info(f"Deal {deal_id}: TXID {txid} has {confirmations} confirmations")
+        
+            if confirmations >= CONFIRMATION_COUNT:
+                # Drop cached counts so /deals reads the confirmed state fresh
+                invalidate_transaction(txid)
+                confirmed_ids.append(deal_id)
+
+        # One short write for every deal confirmed in this pass
+        confirmed_deals = await run_db(_confirm_bitcoin_db, confirmed_ids) if confirmed_ids else []
+
+        for deal in confirmed_deals:
+            logger.info(f"Deal {deal.id}: Bitcoin confirmed! Requesting Lightning invoice")
+
+        # Also check if each Ana can be notified (errors are logged per deal)
+        await asyncio.gather(*(check_and_notify_ana(deal.id) for deal in confirmed_deals))
+
+        # Notify every Carlos to provide Lightning invoice - deals are independent, send concurrently
+        await send_bulk_messages(get_bot(), [
+            (deal.buyer_id, msg.get_message('MSG-021', deal=deal, amount_text=format_amount(deal.amount_sats)))
+            for deal in confirmed_deals
+        ])
+        
+    except Exception as e:
+        logger.error(f"Error in monitor_confirmations: {e}")
+    
+    # Poll for new blocks; fall back to the slow interval if the tip is unknown
+    if tip_height is None:
+        return CONFIRMATION_CHECK_MINUTES * 60
+    return BLOCK_POLL_SECONDS
+
+def _load_pending_payments_db():
+    """Deals waiting for Lightning payment as (id, payment_hash) rows (runs in a worker thread)"""
+    with get_db() as db:
+        return db.execute(
+            select(Deal.id, Deal.payment_hash).where(
+                Deal.status == 'lightning_payment_pending',
+                Deal.payment_hash.isnot(None)
+            )
+        ).all()
+
+def _mark_ready_for_batch_db(deal_ids):
+    """
+    Queue paid deals for the Bitcoin batch with one UPDATE (runs in a worker thread)
+    Returns the updated deals for notification
+    """
+    with session_scope() as db:
+        return db.scalars(
+            update(Deal)
+            .where(Deal.id.in_(deal_ids), Deal.status == 'lightning_payment_pending')
+            .values(
+                status='ready_for_batch',
+                current_stage='batch_processing',
+                completed_at=datetime.now(timezone.utc)
+            )
+            .returning(Deal)
+        ).all()
 
 async def monitor_lightning_payments():
     """
     Monitor Lightning payments - PRODUCTION REAL
     Only advances with real Lightning verification
+    One pass - returns seconds until the next pass (run by scheduler)
     """
-    while True:
-        try:
-            db = get_db()
-            
-            # Find deals waiting for Lightning payment verification
-            pending_deals = db.query(Deal).filter(
-                Deal.status == 'lightning_payment_pending',
-                Deal.payment_hash.isnot(None)
-            ).all()
-            
-            for deal in pending_deals:
-                payment_hash = deal.payment_hash
-                
-                logger.info(f"Deal {deal.id}: Checking Lightning payment {payment_hash}")
-                
-                # Real Lightning verification
-                try:
-                    from bitcoin_utils import check_lightning_payment_status
-                    is_paid = check_lightning_payment_status(payment_hash)
-                except ImportError:
-                    is_paid = False
-                
-                # Only advance if there's REAL Lightning verification
-                if is_paid:
-                    # Mark as completed - add to Bitcoin batch
-                    deal.status = 'ready_for_batch'
-                    deal.current_stage = 'batch_processing'
-                    deal.completed_at = datetime.now(timezone.utc)
-                    db.commit()
-                    
-                    logger.info(f"Deal {deal.id}: Lightning payment verified! Adding to Bitcoin batch")
-                    
-                    # Notify both users
-                    app = Application.builder().token(BOT_TOKEN).build()
-                    
-                    amount = deal.amount_sats
-                    amount_text = format_amount(amount)
-                    
-                    # Notify Carlos (Lightning buyer)
-                    await app.bot.send_message(
-                        chat_id=deal.buyer_id,
-                        text=f"""
-✅ Deal Completed - #{deal.id}
-
-Lightning payment of {amount_text} sats confirmed!
-Your swap out is complete.
-
-Thanks for using P2P Swap Bot!
-                        """,
-                        parse_mode='Markdown'
-                    )
-                    
-                    # Notify Ana (seller) - Bitcoin will be sent in batch
-                    await app.bot.send_message(
-                        chat_id=deal.seller_id,
-                        text=f"""
-✅ Payment Verified - Deal #{deal.id}
-
-Lightning payment received and verified!
-Your {amount_text} sats Bitcoin will be sent in the next batch.
-
-Your funds are secured and will be sent shortly.
-                        """,
-                        parse_mode='Markdown'
-                    )
-                    
-                    logger.info(f"Deal {deal.id}: Added to Bitcoin batch queue")
-                else:
-                    # Log that it's waiting for real verification
-                    logger.info(f"Deal {deal.id}: Waiting for Lightning payment verification")
-            
-            db.close()
-            
-        except Exception as e:
-            logger.error(f"Error in monitor_lightning_payments: {e}")
+    try:
+        # Short read - no session is held while LND and Telegram are called
+        pending_deals = await run_db(_load_pending_payments_db)
+        if not pending_deals:
+            # Nothing to verify - /address wakes this job when a payment becomes pending
+            return IDLE_CHECK_SECONDS
+        
+        paid_ids = []
+        for deal_id, payment_hash in pending_deals:
+            logger.info(f"Deal {deal_id}: Checking Lightning payment {payment_hash}")
         
-        # Check every 30 seconds
-        await asyncio.sleep(30)
+            # Real Lightning verification
+            is_paid = await asyncio.to_thread(check_lightning_payment_status, payment_hash)
+        
+            # Only advance if there's REAL Lightning verification
+            if is_paid:
+                paid_ids.append(deal_id)
+            else:
+                # Log that it's waiting for real verification
+                logger.info(f"Deal {deal_id}: Waiting for Lightning payment verification")
+
+        # Mark as completed - add to Bitcoin batch (one short write for the whole pass)
+        paid_deals = await run_db(_mark_ready_for_batch_db, paid_ids) if paid_ids else []
+
+        messages = []
+        for deal in paid_deals:
+            logger.info(f"Deal {deal.id}: Lightning payment verified! Adding to Bitcoin batch")
+        
+            amount = deal.amount_sats
+            amount_text = format_amount(amount)
+        
+            # Notify Carlos (Lightning buyer) and Ana (seller) - Bitcoin will be sent in batch
+            messages.append((deal.buyer_id, msg.get_message('MSG-034', deal=deal, amount_text=amount_text)))
+            messages.append((deal.seller_id, msg.get_message('MSG-046', deal=deal, amount_text=amount_text)))
+        
+            logger.info(f"Deal {deal.id}: Added to Bitcoin batch queue")
+
+        # Every deal's notifications go out concurrently; one failed send does not block the rest
+        await send_bulk_messages(get_bot(), messages)
+        
+    except Exception as e:
+        logger.error(f"Error in monitor_lightning_payments: {e}")
+    
+    # Check every 30 seconds
+    return LIGHTNING_CHECK_SECONDS
 
 async def monitor_expired_timeouts():
     """
     Monitor and process expired timeouts - Automatic cleanup
     Cancel deals and reactivate offers according to which stage expired
+    All expired deals are cancelled in one transaction, then both parties are notified
+    One pass - returns seconds until the next pass (run by scheduler)
     """
-    while True:
-        try:
-            db = get_db()
-            
-            # Find deals with expired timeout
-            expired_deals = db.query(Deal).filter(
-                Deal.stage_expires_at < datetime.now(timezone.utc),
-                Deal.status.in_(['pending', 'accepted', 'bitcoin_sent', 'bitcoin_confirmed', 'lightning_invoice_received'])
-            ).all()
-            
-            for deal in expired_deals:
-                await handle_expired_deal(deal, db)
-            
-            db.close()
-            
-        except Exception as e:
-            logger.error(f"Error in monitor_expired_timeouts: {e}")
+    try:
+        expired_deals = await run_db(expire_timed_out_deals)
+
+        if expired_deals:
+            bot = get_bot()
+            semaphore = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+
+            async def _notify(deal):
+                async with semaphore:
+                    await handle_expired_deal(bot, deal)
+
+            # handle_expired_deal logs its own failures
+            await asyncio.gather(*(_notify(deal) for deal in expired_deals))
         
-        # Check every 5 minutes
-        await asyncio.sleep(300)
+    except Exception as e:
+        logger.error(f"Error in monitor_expired_timeouts: {e}")
+    
+    # Check every 5 minutes
+    return TIMEOUT_CHECK_SECONDS
 
-async def handle_expired_deal(deal, db):
+def expire_timed_out_deals():
     """
-    Handle expired deal according to stage - Specific actions per timeout
+    Cancel every deal whose stage timeout has passed (runs in a worker thread)
+    Single sweep + single commit; returns the cancelled deals for notification
+    """
+    with session_scope() as db:
+        expired_deals = db.query(Deal).filter(
+            Deal.stage_expires_at < datetime.now(timezone.utc),
+            Deal.status.in_(ACTIVE_DEAL_STATUSES)
+        ).all()
+
+        # Offers to reactivate (TXID timeouts), loaded in one query
+        offer_ids = [deal.offer_id for deal in expired_deals if deal.current_stage == 'txid_required']
+        offers = {}
+        if offer_ids:
+            offers = {offer.id: offer for offer in db.query(Offer).filter(Offer.id.in_(offer_ids)).all()}
+
+        cancelled = []
+        for deal in expired_deals:
+            reason = STAGE_TIMEOUT_REASONS.get(deal.current_stage)
+            if reason is None:
+                continue
+
+            deal.status = 'cancelled'
+            deal.timeout_reason = reason
+
+            if deal.current_stage == 'txid_required':
+                reactivate_offer(offers.get(deal.offer_id))
+
+            cancelled.append(deal)
+
+        return cancelled
+
+async def monitor_expired_offers():
+    """
+    Expire active offers past their 48h visibility window
+    Offers that were never taken have no deal timeout to clean them up
+    One pass - returns seconds until the next pass (run by scheduler)
+    """
+    try:
+        expired_count = await run_db(expire_stale_offers)
+        if expired_count:
+            logger.info(f"Expired {expired_count} offers past their visibility window")
+    except Exception as e:
+        logger.error(f"Error in monitor_expired_offers: {e}")
+
+    return TIMEOUT_CHECK_SECONDS
+
+def expire_stale_offers():
+    """
+    Mark untaken offers past expires_at as expired (runs in a worker thread)
+    Single UPDATE scoped to Offer rows; returns the number of offers expired
+    """
+    with session_scope() as db:
+        result = db.execute(
+            update(Offer)
+            .where(Offer.status == 'active', Offer.expires_at < datetime.now(timezone.utc))
+            .values(status='expired')
+        )
+        return result.rowcount
+
+async def handle_expired_deal(bot, deal):
+    """
+    Notify both parties of an expired deal according to stage
     """
     stage = deal.current_stage
     
     try:
         if stage == 'txid_required':
-            # Carlos didn't send TXID in 30 min - cancel and reactivate offer
-            await cancel_deal_and_reactivate_offer(deal, db, 'TXID timeout')
+            # Carlos didn't send TXID in 30 min - offer reactivated
+            await notify_deal_reactivated(bot, deal, deal.timeout_reason)
             
         elif stage == 'confirming_bitcoin':
-            # Bitcoin not confirmed in 48h - cancel with refund warning
-            await cancel_deal_bitcoin_timeout(deal, db)
-            
-        elif stage == 'invoice_required':
-            # Carlos didn't send invoice in 2h - cancel deal
-            await cancel_deal_and_notify(deal, db, 'Lightning invoice timeout')
+            # Bitcoin not confirmed in 48h - refund warning
+            await notify_bitcoin_timeout(bot, deal)
             
-        elif stage == 'payment_required':
-            # Ana didn't pay Lightning in 2h - cancel deal
-            await cancel_deal_and_notify(deal, db, 'Lightning payment timeout')
+        else:
+            # Invoice not sent or Lightning not paid in 2h
+            await notify_deal_cancelled(bot, deal, deal.timeout_reason)
             
         logger.info(f"Handled expired deal {deal.id} in stage {stage}")
         
@@ -1450,235 +1668,205 @@ async def handle_expired_deal(deal, db):
 # TIMEOUT HELPER FUNCTIONS
 # =============================================================================
 
-async def cancel_deal_and_reactivate_offer(deal, db, reason):
-    """Cancel deal due to TXID timeout and reactivate offer"""
-    deal.status = 'cancelled'
-    deal.timeout_reason = reason
-    
-    # Reactivate offer preserving remaining time with expiration check
-    offer = db.query(Offer).filter(Offer.id == deal.offer_id).first()
-    if offer:
-        # Check if original 48-hour expiration time has passed
-        if offer.expires_at and datetime.now(timezone.utc) > offer.expires_at:
-            # Original time expired - mark as expired, DO NOT return to channel
-            offer.status = 'expired'
-            offer.taken_by = None
-            offer.taken_at = None
-            logger.info(f"Offer {offer.id} marked as expired - original 48h limit passed")
-        else:
-            # Still within 48h - return to channel with remaining time
-            offer.status = 'active'
-            offer.taken_by = None
-            offer.taken_at = None
-            # expires_at preserved - no reset of 48-hour timer
-            logger.info(f"Offer {offer.id} returned to channel with remaining time")
-    
-    db.commit()
-    
-    # Notify both users
-    app = Application.builder().token(BOT_TOKEN).build()
-    
-    await app.bot.send_message(
-        chat_id=deal.buyer_id,
-        text=f"❌ Deal #{deal.id} Cancelled\n\nTimeout: {reason}\nThe offer is available again in the channel."
+# Stages with a timeout and the reason recorded when they expire
+STAGE_TIMEOUT_REASONS = {
+    'txid_required': 'TXID timeout',
+    'confirming_bitcoin': 'Bitcoin confirmation timeout - 48h expired',
+    'invoice_required': 'Lightning invoice timeout',
+    'payment_required': 'Lightning payment timeout',
+}
+
+def reactivate_offer(offer):
+    """Return a taken offer to the channel, or expire it if its 48h window has passed"""
+    if not offer:
+        return
+
+    offer.taken_by = None
+    offer.taken_at = None
+
+    # Check if original 48-hour expiration time has passed
+    if offer.expires_at and datetime.now(timezone.utc) > offer.expires_at:
+        # Original time expired - mark as expired, DO NOT return to channel
+        offer.status = 'expired'
+        logger.info(f"Offer {offer.id} marked as expired - original 48h limit passed")
+    else:
+        # Still within 48h - return to channel with remaining time
+        # expires_at preserved - no reset of 48-hour timer
+        offer.status = 'active'
+        logger.info(f"Offer {offer.id} returned to channel with remaining time")
+
+async def notify_deal_reactivated(bot, deal, reason):
+    """Notify both users that the deal was cancelled and the offer reactivated"""
+    await send_pair(
+        bot.send_message(
+            chat_id=deal.buyer_id,
+            text=msg.get_message('MSG-052', deal=deal, reason=reason)
+        ),
+        bot.send_message(
+            chat_id=deal.seller_id,
+            text=msg.get_message('MSG-053', deal=deal, reason=reason)
+        )
     )
-    
-    await app.bot.send_message(
-        chat_id=deal.seller_id,
-        text=f"🔄 Deal #{deal.id} Cancelled\n\nReason: {reason}\nYour offer is active again in @btcp2pswapoffers"
+
+async def notify_bitcoin_timeout(bot, deal):
+    """Notify both users of a Bitcoin confirmation timeout (48h)"""
+    await send_pair(
+        bot.send_message(
+            chat_id=deal.buyer_id,
+            text=msg.get_message('MSG-054', deal=deal),
+            parse_mode='HTML'
+        ),
+        bot.send_message(
+            chat_id=deal.seller_id,
+            text=msg.get_message('MSG-055', deal=deal)
+        )
     )
 
-async def cancel_deal_bitcoin_timeout(deal, db):
-    """Cancel deal due to Bitcoin confirmation timeout (48h)"""
-    deal.status = 'cancelled'
-    deal.timeout_reason = 'Bitcoin confirmation timeout - 48h expired'
-    db.commit()
+async def notify_deal_cancelled(bot, deal, reason):
+    """Notify both parties of a cancelled deal"""
+    await send_pair(
+        bot.send_message(
+            chat_id=deal.buyer_id,
+            text=msg.get_message('MSG-056', deal=deal, reason=reason)
+        ),
+        bot.send_message(
+            chat_id=deal.seller_id,
+            text=msg.get_message('MSG-056', deal=deal, reason=reason)
+        )
+    )
+
+# =============================================================================
+# BITCOIN BATCH PROCESSING
+# =============================================================================
+
+def seconds_until_aligned(period_seconds):
+    """
+    Seconds until the next wall-clock multiple of period_seconds (3600 = top of the hour)
+    Always in (0, period_seconds] - an aligned call waits a full period, never 0
+    """
+    return period_seconds - (time.time() % period_seconds)
+
+def _run_bitcoin_batch_db():
+    """
+    Lock the payouts, decide whether to batch and send the batch (runs in a worker thread)
+    Locked select and bulk write share one transaction
+    Returns (pending_payouts, batch_txid); batch_txid is None if no batch was sent
+    """
+    with session_scope() as db:
+        # Get deals ready for Bitcoin payment - only the columns the batch and notifications read
+        # Rows stay locked until the batch commits; other workers skip them (no-op on SQLite)
+        pending_payouts = db.execute(
+            select(Deal.id, Deal.seller_id, Deal.seller_bitcoin_address, Deal.amount_sats, Deal.created_at)
+            .where(
+                Deal.status == 'ready_for_batch',
+                Deal.seller_bitcoin_address.isnot(None)
+            )
+            .order_by(Deal.created_at)
+            .with_for_update(skip_locked=True)
+        ).all()
     
-    app = Application.builder().token(BOT_TOKEN).build()
+        if not pending_payouts:
+            logger.info("No pending payouts, waiting for more")
+            return pending_payouts, None
     
-    await app.bot.send_message(
-        chat_id=deal.buyer_id,
-        text=f"⏰ Deal #{deal.id} Expired\n\nBitcoin confirmations not received within 48 hours.\n\nYour funds will return to your wallet automatically.\n\nTXID: `{deal.buyer_bitcoin_txid}`",
-        parse_mode='Markdown'
-    )
+        logger.info(f"{len(pending_payouts)} pending payouts, checking batch criteria")
     
-    await app.bot.send_message(
-        chat_id=deal.seller_id,
-        text=f"⏰ Deal #{deal.id} Expired\n\nBitcoin confirmations timeout (48h).\nDeal cancelled, your offer remains expired."
-    )
+        # Oldest deal comes first (ordered by the ready-for-batch index)
+        oldest_deal = pending_payouts[0]
+        elapsed_minutes = (datetime.now(timezone.utc) - oldest_deal.created_at).total_seconds() / 60
+    
+        # Process batch if enough deals OR enough time passed
+        if len(pending_payouts) < MIN_BATCH_SIZE and elapsed_minutes < BATCH_WAIT_MINUTES:
+            return pending_payouts, None
 
-async def cancel_deal_and_notify(deal, db, reason):
-    """Cancel deal and notify both parties"""
-    deal.status = 'cancelled'
-    deal.timeout_reason = reason
-    db.commit()
+        if len(pending_payouts) >= MIN_BATCH_SIZE:
+            reason = f"batch size reached ({len(pending_payouts)} >= {MIN_BATCH_SIZE})"
+        else:
+            reason = f"time limit reached ({elapsed_minutes:.1f} >= {BATCH_WAIT_MINUTES} minutes)"
     
-    app = Application.builder().token(BOT_TOKEN).build()
+        logger.info(f"Processing batch of {len(pending_payouts)} payouts - {reason}")
     
-    await app.bot.send_message(
-        chat_id=deal.buyer_id,
-        text=f"❌ Deal #{deal.id} Cancelled\n\nTimeout: {reason}\nDeal terminated due to inactivity."
-    )
+        # Process the batch
+        batch_txid = send_bitcoin_batch(pending_payouts, db)
     
-    await app.bot.send_message(
-        chat_id=deal.seller_id,
-        text=f"❌ Deal #{deal.id} Cancelled\n\nTimeout: {reason}\nDeal terminated due to inactivity."
-    )
-
-# =============================================================================
-# BITCOIN BATCH PROCESSING
-# =============================================================================
+        if batch_txid:
+            logger.info(f"Successfully processed batch of {len(pending_payouts)} Bitcoin payouts")
+        else:
+            logger.error("Failed to process Bitcoin batch")
+        return pending_payouts, batch_txid
 
 async def process_bitcoin_batches():
     """
     Process Bitcoin batches - Step 16 of flow
     Send Bitcoin to Ana when there are enough deals or time limit
+    One pass - returns seconds until the next pass (run by scheduler)
     """
-    # Batch configuration - ADJUST ACCORDING TO NEEDS
-    MIN_BATCH_SIZE = 3          # Minimum deals to process batch
-    MAX_WAIT_MINUTES = BATCH_WAIT_MINUTES  # Maximum wait time
-    
-    while True:
-        try:
-            db = get_db()
-            
-            # Get deals ready for Bitcoin payment
-            pending_payouts = db.query(Deal).filter(
-                Deal.status == 'ready_for_batch',
-                Deal.seller_bitcoin_address.isnot(None)
-            ).all()
-            
-            if not pending_payouts:
-                logger.info("No pending payouts, waiting for more")
-                db.close()
-                # Wait until next exact hour (00 minutes)
-                current_time = time.time()
-                seconds_since_epoch = int(current_time)
-                seconds_in_minute = seconds_since_epoch % 60
-                minutes_since_hour = (seconds_since_epoch // 60) % 60
-
-                # Calculate seconds until next exact hour
-                minutes_to_next_hour = 60 - minutes_since_hour
-                if minutes_to_next_hour == 60:
-                    minutes_to_next_hour = 0
-                    
-                seconds_to_wait = (minutes_to_next_hour * 60) - seconds_in_minute
-                await asyncio.sleep(seconds_to_wait)
-                continue
-            
-            logger.info(f"{len(pending_payouts)} pending payouts, checking batch criteria")
-            
-            # Get oldest deal to check time
-            oldest_deal = min(pending_payouts, key=lambda d: d.created_at)
-            elapsed_minutes = (datetime.now(timezone.utc) - oldest_deal.created_at).total_seconds() / 60
-            
-            # Process batch if enough deals OR enough time passed
-            if len(pending_payouts) >= MIN_BATCH_SIZE or elapsed_minutes >= MAX_WAIT_MINUTES:
-                
-                if len(pending_payouts) >= MIN_BATCH_SIZE:
-                    reason = f"batch size reached ({len(pending_payouts)} >= {MIN_BATCH_SIZE})"
-                else:
-                    reason = f"time limit reached ({elapsed_minutes:.1f} >= {MAX_WAIT_MINUTES} minutes)"
-                
-                logger.info(f"Processing batch of {len(pending_payouts)} payouts - {reason}")
-                
-                # Process the batch
-                success = await send_bitcoin_batch(pending_payouts, db)
-                
-                if success:
-                    logger.info(f"Successfully processed batch of {len(pending_payouts)} Bitcoin payouts")
-                else:
-                    logger.error("Failed to process Bitcoin batch")
-            
-            db.close()
-            # Wait until next exact hour to check again
-            current_time = time.time()
-            seconds_since_epoch = int(current_time)
-            seconds_in_minute = seconds_since_epoch % 60
-            minutes_since_hour = (seconds_since_epoch // 60) % 60
-
-            # Calculate seconds until next exact hour
-            minutes_to_next_hour = 60 - minutes_since_hour
-            if minutes_to_next_hour == 60:
-                minutes_to_next_hour = 0
-                
-            seconds_to_wait = (minutes_to_next_hour * 60) - seconds_in_minute
-            await asyncio.sleep(seconds_to_wait)
-            
-        except Exception as e:
-            logger.error(f"Error in batch processing: {e}")
-            await asyncio.sleep(300)
+    try:
+        pending_payouts, batch_txid = await run_db(_run_bitcoin_batch_db)
+        
+        # Notify sellers (Ana) once the session and its row locks are released
+        if batch_txid:
+            await notify_sellers_batch_sent(pending_payouts, batch_txid)
+        
+        # Wait until next exact hour (00 minutes) to check again
+        return seconds_until_aligned(BATCH_CHECK_SECONDS)
+        
+    except Exception as e:
+        logger.error(f"Error in batch processing: {e}")
+        return 300
 
-async def send_bitcoin_batch(pending_deals, db):
+def send_bitcoin_batch(pending_deals, db):
     """
     Send real Bitcoin using bot's wallet - Step 16 of flow
     Ana receives Bitcoin at her provided address
+    Runs inside _run_bitcoin_batch_db's worker thread and transaction
+    Returns the batch txid, or None if the batch failed (caller notifies sellers)
     """
     try:
-        # Group deals by amount for privacy
-        deals_by_amount = {}
+        # One transaction with one output per seller, whatever the amount
+        outputs = [(deal.seller_bitcoin_address, deal.amount_sats) for deal in pending_deals]
+        
+        # Amount groups are kept for logging only (same-size outputs help privacy)
+        deals_by_amount = defaultdict(list)
         for deal in pending_deals:
-            amount = deal.amount_sats
-            if amount not in deals_by_amount:
-                deals_by_amount[amount] = []
-            deals_by_amount[amount].append(deal)
+            deals_by_amount[deal.amount_sats].append(deal)
+        summary = ", ".join(f"{len(group)} x {amount_sats}" for amount_sats, group in deals_by_amount.items())
+        logger.info(f"Creating Bitcoin batch transaction with {len(outputs)} outputs ({summary} sats)")
         
-        # Process each amount group
-        for amount_sats, amount_deals in deals_by_amount.items():
-            logger.info(f"Creating Bitcoin batch transaction for {len(amount_deals)} deals of {amount_sats} sats each")
-            
-            # For testing, simulate Bitcoin transaction
-            # In production: integrate with wallet_manager for real transactions
-            simulated_txid = f"batch_{amount_sats}_{len(amount_deals)}_{int(datetime.now(timezone.utc).timestamp())}"
-            
-            # Mark deals as completed
-            for deal in amount_deals:
-                deal.bitcoin_txid = simulated_txid
-                deal.status = 'completed'
-                deal.completed_at = datetime.now(timezone.utc)
-            
-            # Notify sellers (Ana)
-            await notify_sellers_batch_sent(amount_deals, simulated_txid)
-            
-            logger.info(f"Simulated Bitcoin batch sent: {simulated_txid} for {len(amount_deals)} deals")
+        # For testing, simulate Bitcoin transaction
+        # In production: build, sign and broadcast one PSBT with all outputs via wallet_manager
+        now = datetime.now(timezone.utc)
+        simulated_txid = f"batch_{len(outputs)}_{int(now.timestamp())}"
         
+        # Mark every deal in the batch as completed with one UPDATE
+        db.execute(
+            update(Deal)
+            .where(Deal.id.in_([deal.id for deal in pending_deals]))
+            .values(bitcoin_txid=simulated_txid, status='completed', completed_at=now)
+        )
         db.commit()
-        return True
+        
+        logger.info(f"Simulated Bitcoin batch sent: {simulated_txid} for {len(outputs)} deals")
+        return simulated_txid
         
     except Exception as e:
         logger.error(f"Error in send_bitcoin_batch: {e}")
-        return False
+        return None
 
 async def notify_sellers_batch_sent(deals, txid):
     """
     Notify sellers that Bitcoin was sent - Step 16 final
     Ana receives confirmation that she received Bitcoin
     """
-    app = Application.builder().token(BOT_TOKEN).build()
-    
+    messages = []
     for deal in deals:
         amount = deal.amount_sats
         amount_text = format_amount(amount)
         
-        try:
-            await app.bot.send_message(
-                chat_id=deal.seller_id,
-                text=f"""
-💰 Bitcoin Sent - Deal #{deal.id}
-
-Your {amount_text} sats have been sent!
-
-Transaction: {txid}
-Address: {deal.seller_bitcoin_address}
-
-Check testnet blockchain explorer.
-Swap completed successfully! ✅
-
-Thanks for using P2P Swap Bot!
-                """
-            )
-        except Exception as e:
-            logger.error(f"Failed to notify seller {deal.seller_id}: {e}")
+        messages.append((deal.seller_id, msg.get_message('MSG-047', deal=deal, amount_text=amount_text, txid=txid)))
+    
+    # Sellers are independent - notify them concurrently
+    await send_bulk_messages(get_bot(), messages)
 
 # =============================================================================
 # LNPROXY PRIVACY HANDLING
@@ -1688,8 +1876,6 @@ async def handle_lnproxy_failure(update, deal_id, invoice):
     """
     Handle when lnproxy fails - show decision UI to Carlos
     """
-    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-    
     keyboard = [
         [InlineKeyboardButton("🔓 Reveal Original Invoice", callback_data=f"reveal_invoice_{deal_id}")],
         [InlineKeyboardButton("⏳ Keep Trying (20min retries)", callback_data=f"retry_lnproxy_{deal_id}")]
@@ -1698,66 +1884,81 @@ async def handle_lnproxy_failure(update, deal_id, invoice):
     
     await update.message.reply_text(
         msg.get_message('MSG-027', deal_id=deal_id),
-        reply_markup=reply_markup,
-        parse_mode='Markdown'
+        reply_markup=reply_markup
     )
 
-async def handle_reveal_invoice(query, user, deal_id, db):
+async def handle_reveal_invoice(query, user, deal_id):
     """
     Handle when Carlos decides to reveal his original invoice
     """
-    deal = db.query(Deal).filter(Deal.id == deal_id, Deal.seller_id == user.id).first()
+    # Update deal with original invoice
+    amount = await run_db(_reveal_invoice_db, deal_id, user.id, 'awaiting_privacy_decision')
     
-    if not deal or deal.status != 'awaiting_privacy_decision':
+    if amount is None:
         await query.edit_message_text("❌ Deal not found or already processed")
-        db.close()
         return
     
-    # Update deal with original invoice
-    deal.status = 'lightning_invoice_received'
-    deal.current_stage = 'payment_required'
-    deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=LIGHTNING_PAYMENT_HOURS)
-    db.commit()
-    
-    amount_text = format_amount(deal.amount_sats)
+    amount_text = format_amount(amount)
     
     await query.edit_message_text(
         msg.get_message('MSG-028',
             deal_id=deal_id,
             amount_text=amount_text,
             LIGHTNING_PAYMENT_HOURS=LIGHTNING_PAYMENT_HOURS
-        ),
-        parse_mode='Markdown'
+        )
     )
     
-    db.close()
-    
     # Call coordinated function to check if Ana should be notified
     await check_and_notify_ana(deal_id)
 
-async def handle_retry_lnproxy(query, user, deal_id, db):
+def _start_lnproxy_retries_db(deal_id, user_id):
+    """Put a deal into 20-minute lnproxy retries (runs in a worker thread); False if not allowed"""
+    with session_scope() as db:
+        deal = db.query(Deal).filter(
+            Deal.id == deal_id,
+            Deal.seller_id == user_id,
+            Deal.status == 'awaiting_privacy_decision'
+        ).first()
+        if not deal:
+            return False
+
+        deal.status = 'retrying_lnproxy'
+        deal.current_stage = 'privacy_retry'
+        deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=2)  # 2 hours for retries
+        return True
+
+async def handle_retry_lnproxy(query, user, deal_id):
     """
     Handle when Carlos decides to keep trying lnproxy
     """
-    deal = db.query(Deal).filter(Deal.id == deal_id, Deal.seller_id == user.id).first()
-    
-    if not deal or deal.status != 'awaiting_privacy_decision':
+    # Update deal for retries
+    if not await run_db(_start_lnproxy_retries_db, deal_id, user.id):
         await query.edit_message_text("❌ Deal not found or already processed")
-        db.close()
         return
     
-    # Update deal for retries
-    deal.status = 'retrying_lnproxy'
-    deal.current_stage = 'privacy_retry'
-    deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=2)  # 2 hours for retries
-    db.commit()
-    db.close()
-    
     await query.edit_message_text(
-        msg.get_message('MSG-029', deal_id=deal_id),
-        parse_mode='Markdown'
+        msg.get_message('MSG-029', deal_id=deal_id)
     )
 
+def _reveal_invoice_db(deal_id, user_id, from_status):
+    """
+    Use the original (unwrapped) invoice and start the payment stage (runs in a worker thread)
+    Returns the deal amount, or None if the deal is not the user's or not in from_status
+    """
+    with session_scope() as db:
+        deal = db.query(Deal).filter(
+            Deal.id == deal_id,
+            Deal.seller_id == user_id,  # Carlos must be the seller (who sends invoice)
+            Deal.status == from_status
+        ).first()
+        if not deal:
+            return None
+
+        deal.status = 'lightning_invoice_received'
+        deal.current_stage = 'payment_required'
+        deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=LIGHTNING_PAYMENT_HOURS)
+        return deal.amount_sats
+
 async def reveal_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Command /reveal - Carlos can change his mind and reveal original invoice
@@ -1778,39 +1979,25 @@ async def reveal_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
         return
     
-    db = get_db()
-    deal = db.query(Deal).filter(
-        Deal.id == deal_id,
-        Deal.seller_id == user.id,  # Carlos must be the seller (who sends invoice)
-        Deal.status == 'retrying_lnproxy'
-    ).first()
+    # Change from retries to revealed invoice
+    amount = await run_db(_reveal_invoice_db, deal_id, user.id, 'retrying_lnproxy')
     
-    if not deal:
-        db.close()
+    if amount is None:
         await update.message.reply_text(
             msg.get_message('MSG-032', deal_id=deal_id)
         )
         return
     
-    # Change from retries to revealed invoice
-    deal.status = 'lightning_invoice_received'
-    deal.current_stage = 'payment_required'
-    deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=LIGHTNING_PAYMENT_HOURS)
-    db.commit()
-    
-    amount_text = format_amount(deal.amount_sats)
+    amount_text = format_amount(amount)
     
     await update.message.reply_text(
         msg.get_message('MSG-033',
             deal_id=deal_id,
             amount_text=amount_text,
             LIGHTNING_PAYMENT_HOURS=LIGHTNING_PAYMENT_HOURS
-        ),
-        parse_mode='Markdown'
+        )
     )
     
-    db.close()
-    
     # Check if Ana can be notified now
     await check_and_notify_ana(deal_id)
 
@@ -1818,55 +2005,67 @@ async def reveal_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 # LNPROXY RETRY MONITORING
 # =============================================================================
 
-async def monitor_lnproxy_retries():
+def _load_retry_deals_db():
     """
-    Monitor for lnproxy retries every 20 minutes for 2 hours maximum
+    Deals in lnproxy retries as (id, lightning_invoice, stage_expires_at, last_updated) rows
+    (runs in a worker thread)
     """
-    while True:
-        try:
-            db = get_db()
-            
-            # Find deals waiting for lnproxy retries
-            retry_deals = db.query(Deal).filter(
+    with get_db() as db:
+        return db.execute(
+            select(Deal.id, Deal.lightning_invoice, Deal.stage_expires_at, Deal.last_updated).where(
                 Deal.status == 'retrying_lnproxy',
                 Deal.current_stage == 'privacy_retry'
-            ).all()
-            
-            for deal in retry_deals:
-                # Check if deal has expired (2 hours)
-                if deal.stage_expires_at and datetime.now(timezone.utc) > deal.stage_expires_at:
-                    logger.info(f"Deal {deal.id}: lnproxy retry timeout after 2 hours")
-                    await handle_lnproxy_timeout(deal)
-                    continue
-                
-                # Check if it's time to retry (every 20 minutes)
-                last_attempt = deal.last_updated
-                minutes_since_last = (datetime.now(timezone.utc) - last_attempt).total_seconds() / 60
-                
-                if minutes_since_last >= 20:
-                    logger.info(f"Deal {deal.id}: Starting 20-minute lnproxy retry")
-                    await perform_lnproxy_retry(deal)
-            
-            db.close()
-            
-        except Exception as e:
-            logger.error(f"Error in monitor_lnproxy_retries: {e}")
-        
-        # Check every 5 minutes
-        await asyncio.sleep(300)
+            )
+        ).all()
 
-async def handle_lnproxy_timeout(deal):
+async def monitor_lnproxy_retries():
     """
-    Handle lnproxy timeout after 2 hours - cancel deal and refund
+    Monitor for lnproxy retries every 20 minutes for 2 hours maximum
+    One pass - returns seconds until the next pass (run by scheduler)
     """
     try:
-        db = get_db()
+        # Short read - no session is held during the lnproxy attempts and their 30 s pauses
+        retry_deals = await run_db(_load_retry_deals_db)
+        now = datetime.now(timezone.utc)
+    
+        for deal_id, original_invoice, stage_expires_at, last_attempt in retry_deals:
+            # Check if deal has expired (2 hours)
+            if stage_expires_at and now > stage_expires_at:
+                logger.info(f"Deal {deal_id}: lnproxy retry timeout after 2 hours")
+                await handle_lnproxy_timeout(deal_id)
+                continue
+        
+            # Check if it's time to retry (every 20 minutes)
+            minutes_since_last = (now - last_attempt).total_seconds() / 60
         
+            if minutes_since_last >= 20:
+                logger.info(f"Deal {deal_id}: Starting 20-minute lnproxy retry")
+                await perform_lnproxy_retry(deal_id, original_invoice)
+        
+    except Exception as e:
+        logger.error(f"Error in monitor_lnproxy_retries: {e}")
+    
+    # Check every 5 minutes
+    return LNPROXY_RETRY_CHECK_SECONDS
+
+def _expire_privacy_retry_db(deal_id):
+    """
+    Expire a deal whose lnproxy retries ran out and reactivate its offer (runs in a worker thread)
+    Returns (buyer_id, offer_found), or None if the deal already left 'retrying_lnproxy'
+    """
+    with session_scope() as db:
+        # Deal and its offer in a single query, changed and committed in this same session
+        row = db.query(Deal, Offer).outerjoin(
+            Offer, Offer.id == Deal.offer_id
+        ).filter(Deal.id == deal_id, Deal.status == 'retrying_lnproxy').first()
+        if not row:
+            return None
+        deal, offer = row
+
         # Update deal as expired
         deal.status = 'expired_privacy_timeout'
-        
+
         # Reactivate Ana's offer to return to channel with expiration check
-        offer = db.query(Offer).filter(Offer.id == deal.offer_id).first()
         if offer:
             # Check if original 48-hour expiration time has passed
             if offer.expires_at and datetime.now(timezone.utc) > offer.expires_at:
@@ -1882,13 +2081,24 @@ async def handle_lnproxy_timeout(deal):
                 offer.taken_at = None
                 # expires_at preserved - no reset of 48-hour timer
                 logger.info(f"Deal {deal.id}: Ana's offer {offer.id} returned to channel after lnproxy timeout")
-            
+        return deal.buyer_id, offer is not None
+
+async def handle_lnproxy_timeout(deal_id):
+    """
+    Handle lnproxy timeout after 2 hours - cancel deal and refund
+    """
+    try:
+        expired = await run_db(_expire_privacy_retry_db, deal_id)
+        if not expired:
+            return
+        buyer_id, offer_found = expired
+
+        if offer_found:
             # Notify Carlos (buyer) about timeout and refund
-            app = Application.builder().token(BOT_TOKEN).build()
-            await app.bot.send_message(
-                chat_id=deal.buyer_id,  # Carlos - the buyer
+            await get_bot().send_message(
+                chat_id=buyer_id,  # Carlos - the buyer
                 text=f"""
-Deal #{deal.id} has expired after 2 hours.
+Deal #{deal_id} has expired after 2 hours.
 
 Your Bitcoin will be returned to the original sending address minus network fees.
 
@@ -1896,79 +2106,187 @@ Refund will be processed in the next batch.
                 """
             )
         
-        db.commit()
-        db.close()
-        
     except Exception as e:
-        logger.error(f"Error handling lnproxy timeout for deal {deal.id}: {e}")
+        logger.error(f"Error handling lnproxy timeout for deal {deal_id}: {e}")
 
-async def perform_lnproxy_retry(deal):
+def _finish_lnproxy_retry_db(deal_id, wrapped_invoice):
+    """
+    Record the result of a retry round on the deal (runs in a worker thread)
+    With a wrapped invoice the deal moves to payment; otherwise only last_updated is bumped
+    Returns False if the deal already left 'retrying_lnproxy'
+    """
+    now = datetime.now(timezone.utc)
+    values = {'last_updated': now}
+    if wrapped_invoice:
+        values.update(
+            lightning_invoice=wrapped_invoice,
+            status='lightning_invoice_received',
+            current_stage='payment_required',
+            stage_expires_at=now + timedelta(hours=LIGHTNING_PAYMENT_HOURS)
+        )
+
+    # Guarded UPDATE - a deal that timed out or was revealed meanwhile is left alone
+    with session_scope() as db:
+        result = db.execute(
+            update(Deal)
+            .where(Deal.id == deal_id, Deal.status == 'retrying_lnproxy')
+            .values(**values)
+        )
+        return result.rowcount == 1
+
+async def perform_lnproxy_retry(deal_id, original_invoice):
     """
     Perform lnproxy retry for a specific deal
     """
     try:
-        db = get_db()
-        
-        # Get original invoice from deal
-        original_invoice = deal.lightning_invoice
-        
-        logger.info(f"Deal {deal.id}: Starting lnproxy retry attempt")
-        
+        logger.info(f"Deal {deal_id}: Starting lnproxy retry attempt")
+    
         # Try lnproxy for 5 minutes maximum (3 attempts)
-        from lnproxy_utils import wrap_invoice_for_privacy
-        import time
-        
         max_attempts = 3
         timeout_minutes = 5
         start_time = time.time()
-        
+    
         for attempt in range(max_attempts):
             # Check timeout (5 minutes maximum)
             elapsed = (time.time() - start_time) / 60
             if elapsed >= timeout_minutes:
-                logger.warning(f"Deal {deal.id}: lnproxy retry timeout after {elapsed:.1f} minutes")
+                logger.warning(f"Deal {deal_id}: lnproxy retry timeout after {elapsed:.1f} minutes")
                 break
-                
-            logger.info(f"Deal {deal.id}: lnproxy retry attempt {attempt + 1}/{max_attempts}")
-            success, result = wrap_invoice_for_privacy(original_invoice)
             
+            logger.info(f"Deal {deal_id}: lnproxy retry attempt {attempt + 1}/{max_attempts}")
+            success, result = await asyncio.to_thread(wrap_invoice_for_privacy, original_invoice)
+        
             if success and result.get('wrapped_invoice'):
                 # lnproxy worked! Update deal
-                deal.lightning_invoice = result['wrapped_invoice']
-                deal.status = 'lightning_invoice_received'
-                deal.current_stage = 'payment_required'
-                deal.stage_expires_at = datetime.now(timezone.utc) + timedelta(hours=LIGHTNING_PAYMENT_HOURS)
-                deal.last_updated = datetime.now(timezone.utc)
-                db.commit()
-                
-                logger.info(f"Deal {deal.id}: lnproxy retry successful on attempt {attempt + 1}")
+                if await run_db(_finish_lnproxy_retry_db, deal_id, result['wrapped_invoice']):
+                    logger.info(f"Deal {deal_id}: lnproxy retry successful on attempt {attempt + 1}")
                 
-                # Check if Ana can be notified
-                await check_and_notify_ana(deal.id)
-                
-                db.close()
+                    # Check if Ana can be notified
+                    await check_and_notify_ana(deal_id)
                 return True
             else:
-                logger.warning(f"Deal {deal.id}: lnproxy retry attempt {attempt + 1} failed")
+                logger.warning(f"Deal {deal_id}: lnproxy retry attempt {attempt + 1} failed")
                 if attempt < max_attempts - 1:
-                    time.sleep(30)  # Wait 30 seconds between attempts
-        
+                    await asyncio.sleep(30)  # Wait 30 seconds between attempts
+    
         # Update timestamp for next retry in 20 minutes
-        deal.last_updated = datetime.now(timezone.utc)
-        db.commit()
-        db.close()
+        await run_db(_finish_lnproxy_retry_db, deal_id, None)
         
-        logger.info(f"Deal {deal.id}: lnproxy retry failed, will try again in 20 minutes")
+        logger.info(f"Deal {deal_id}: lnproxy retry failed, will try again in 20 minutes")
         return False
         
     except Exception as e:
-        logger.error(f"Error performing lnproxy retry for deal {deal.id}: {e}")
+        logger.error(f"Error performing lnproxy retry for deal {deal_id}: {e}")
         return False
 
+# =============================================================================
+# BACKGROUND SCHEDULER
+# =============================================================================
+
+# Periodic jobs: each runs one pass and returns seconds until its next pass
+SCHEDULED_JOBS = (
+    monitor_confirmations,
+    monitor_lightning_payments,
+    monitor_expired_timeouts,
+    monitor_expired_offers,
+    monitor_lnproxy_retries,
+    process_bitcoin_batches,
+)
+
+# Jobs a handler asked to run now (new work arrived) instead of at their next pass
+_wake_requests = set()
+_scheduler_wakeup = asyncio.Event()
+
+def wake_job(job):
+    """Run a scheduled job as soon as possible (call from the event loop)"""
+    _wake_requests.add(job)
+    _scheduler_wakeup.set()
+
+async def scheduler():
+    """
+    Single loop for all background jobs
+    Sleeps until the next job is due; due jobs run as tasks so a slow pass
+    (lnproxy retries, batch sends) never delays the others, and a job is
+    never run again while its previous pass is still going
+    wake_job() moves a job's next pass to now, so idle jobs can poll slowly
+    """
+    loop = asyncio.get_running_loop()
+    next_run = {job: loop.time() for job in SCHEDULED_JOBS}
+    running = {}  # task -> job
+    rerun = set()  # Woken while a pass was running - that pass may have missed the new work
+    waiter = None
+
+    try:
+        while True:
+            now = loop.time()
+            for job in _wake_requests:
+                if next_run[job] is None:
+                    rerun.add(job)
+                else:
+                    next_run[job] = now
+            _wake_requests.clear()
+
+            for job, due in next_run.items():
+                if due is not None and due <= now:
+                    running[asyncio.create_task(job())] = job
+                    next_run[job] = None  # Rescheduled when this pass finishes
+
+            upcoming = [due for due in next_run.values() if due is not None]
+            timeout = max(0, min(upcoming) - loop.time()) if upcoming else None
+
+            # Wake on the next due job, a finished pass or a wake_job() call
+            waiter = asyncio.ensure_future(_scheduler_wakeup.wait())
+            done, _ = await asyncio.wait({waiter, *running}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+            _scheduler_wakeup.clear()
+
+            for task in done:
+                if task is waiter:
+                    continue
+                job = running.pop(task)
+                try:
+                    delay = task.result()
+                except Exception as e:
+                    logger.error(f"Error in scheduled job {job.__name__}: {e}")
+                    delay = SCHEDULER_ERROR_SECONDS
+                if job in rerun:
+                    rerun.discard(job)
+                    delay = 0
+                next_run[job] = loop.time() + delay
+    finally:
+        if waiter is not None:
+            waiter.cancel()
+        for task in running:
+            task.cancel()
+
 # =============================================================================
 # MAIN FUNCTION AND APPLICATION SETUP
 # =============================================================================
 
+async def post_init(application):
+    """Start the channel post worker and the background scheduler on the application's loop"""
+    global channel_queue, channel_worker_task, scheduler_task
+    if OFFERS_CHANNEL_ID:
+        channel_queue = asyncio.Queue()
+        channel_worker_task = asyncio.create_task(channel_post_worker(application.bot))
+
+    # Background jobs share the bot and its HTTP pool with the handlers
+    scheduler_task = asyncio.create_task(scheduler())
+
+async def post_shutdown(application):
+    """Stop the channel post worker and scheduler, release outbound HTTP connections"""
+    global channel_queue, scheduler_task
+    if channel_worker_task:
+        channel_worker_task.cancel()
+    channel_queue = None
+
+    if scheduler_task:
+        scheduler_task.cancel()
+        scheduler_task = None
+
+    close_bitcoin_manager()
+    close_lnproxy_client()
+
 def main():
     """
     Main bot function - Configure all handlers and monitors
@@ -2002,32 +2320,19 @@ def main():
         logger.error(f"Swap Logger initialization failed: {e}")
         return
     
-    # Create Telegram application
-    application = Application.builder().token(BOT_TOKEN).build()
-
-    # Start background monitors in threads
-    monitor_thread = threading.Thread(target=lambda: asyncio.run(monitor_confirmations()))
-    monitor_thread.daemon = True
-    monitor_thread.start()
-
-    monitor_thread_ln = threading.Thread(target=lambda: asyncio.run(monitor_lightning_payments()))
-    monitor_thread_ln.daemon = True
-    monitor_thread_ln.start() 
-
-    # Monitor expired timeouts
-    timeout_thread = threading.Thread(target=lambda: asyncio.run(monitor_expired_timeouts()))
-    timeout_thread.daemon = True
-    timeout_thread.start()
-
-    # Monitor lnproxy retries
-    lnproxy_retry_thread = threading.Thread(target=lambda: asyncio.run(monitor_lnproxy_retries()))
-    lnproxy_retry_thread.daemon = True
-    lnproxy_retry_thread.start()
+    # Create Telegram application - the only one; handlers and background jobs share its bot
+    global BOT_APP
+    application = BOT_APP = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .connection_pool_size(TELEGRAM_POOL_SIZE)
+        .pool_timeout(TELEGRAM_POOL_TIMEOUT)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
-    # Bitcoin batch processing
-    batch_thread = threading.Thread(target=lambda: asyncio.run(process_bitcoin_batches()))
-    batch_thread.daemon = True
-    batch_thread.start()
+    # Background jobs are started by the scheduler in post_init
 
     # Add command handlers
     application.add_handler(CommandHandler("start", start))
@@ -0,0 +1,66 @@
+"""
+===============================================================================
+CACHE UTILITIES FOR P2P SWAP BOT
+===============================================================================
+Cache en memoria con expiración por tiempo (TTL) para evitar llamadas
+repetidas a APIs externas y a la base de datos
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Cache simple con expiración por entrada y tamaño máximo
+    Cuando se llena, descarta la entrada más antigua (orden de inserción)
+    Seguro para usar desde varios hilos (monitores y handlers comparten instancias)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Retorna el valor guardado o `default` si no existe o expiró"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._data.pop(key, None)
+                return default
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        """Guarda un valor; `ttl` permite sobreescribir la expiración por defecto"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (expires_at, value)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Elimina una entrada y retorna su valor (sin verificar expiración)"""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        return entry[1]
+
+    def clear(self):
+        """Vacía el cache"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
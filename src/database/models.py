@@ -6,9 +6,12 @@ Define la estructura de datos para usuarios, ofertas y deals
 Optimizado para principiantes - Fácil de entender y modificar
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, Boolean, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from contextlib import contextmanager
 from datetime import datetime
 import os
 
@@ -76,6 +79,15 @@ class Offer(Base):
     taken_by = Column(Integer, index=True)      # telegram_id de quien tomó la oferta
     taken_at = Column(DateTime)
     expires_at = Column(DateTime)               # Auto-expiración de ofertas
+
+    # Índice parcial: solo las ofertas activas (las que se buscan en /take y /offers)
+    __table_args__ = (
+        Index(
+            'ix_offers_active', 'status',
+            sqlite_where=text("status = 'active'"),
+            postgresql_where=text("status = 'active'")
+        ),
+    )
     
     def __repr__(self):
         return f"<Offer(id={self.id}, type={self.offer_type}, amount={self.amount_sats}, status={self.status})>"
@@ -172,6 +184,29 @@ class Deal(Base):
     offer_expires_at = Column(DateTime, index=True)         # Timeout de oferta original (48h)
     stage_warnings_sent = Column(Integer, default=0)       # Avisos de timeout enviados
     timeout_reason = Column(String(100))                   # Razón del timeout si ocurre
+
+    # Índices compuestos para queries frecuentes
+    __table_args__ = (
+        # Búsqueda de deals por estado + timeout de etapa (monitores y fix_stuck_deal.py)
+        Index('ix_deals_status_expires', 'status', 'stage_expires_at'),
+        # Deals en una etapa concreta con timeout pendiente (monitor de confirmaciones, reintentos lnproxy)
+        Index('ix_deals_status_stage_expires', 'status', 'current_stage', 'stage_expires_at'),
+        # Deal activo del comprador (/txid, /invoice)
+        Index('ix_deals_buyer_status', 'buyer_id', 'status'),
+        # Deals del vendedor por estado (/deals combina ambos índices con OR)
+        Index('ix_deals_seller_status', 'seller_id', 'status'),
+        # Parciales: solo indexan los deals en los estados que consultan /address y el batch
+        Index(
+            'ix_deals_awaiting_address', 'seller_id',
+            sqlite_where=text("status = 'awaiting_bitcoin_address' AND seller_bitcoin_address IS NULL"),
+            postgresql_where=text("status = 'awaiting_bitcoin_address' AND seller_bitcoin_address IS NULL")
+        ),
+        Index(
+            'ix_deals_ready_batch', 'created_at',
+            sqlite_where=text("status = 'ready_for_batch' AND seller_bitcoin_address IS NOT NULL"),
+            postgresql_where=text("status = 'ready_for_batch' AND seller_bitcoin_address IS NOT NULL")
+        ),
+    )
     
     def __repr__(self):
         return f"<Deal(id={self.id}, seller={self.seller_id}, buyer={self.buyer_id}, amount={self.amount_sats}, status={self.status})>"
@@ -236,6 +271,17 @@ if DATABASE_URL.startswith('sqlite'):
             "timeout": 20  # Timeout para operaciones de base de datos
         }
     )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        WAL: las lecturas (/offers, /deals, monitores) no esperan a las escrituras (/take, ofertas)
+        synchronous=NORMAL: en WAL solo hace fsync en los checkpoints, no en cada commit
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
 else:
     # Configuración para PostgreSQL/MySQL
     engine = create_engine(
@@ -247,9 +293,11 @@ else:
     )
 
 # Factory de sesiones
+# expire_on_commit=False: los objetos siguen legibles después del commit sin otra query
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine
 )
 
@@ -264,11 +312,21 @@ def create_tables():
     """
     try:
         Base.metadata.create_all(bind=engine)
+        create_indexes()
         print("✅ Database tables created successfully")
     except Exception as e:
         print(f"❌ Error creating tables: {e}")
         raise
 
+def create_indexes():
+    """
+    Crear índices que falten en tablas ya existentes
+    create_all solo crea índices al crear la tabla; esto cubre bases de datos anteriores
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
 def get_db():
     """
     Obtener sesión de base de datos
@@ -276,6 +334,53 @@ def get_db():
     """
     return SessionLocal()
 
+@contextmanager
+def session_scope():
+    """
+    Sesión con un único commit al final del bloque
+    Hace rollback si ocurre una excepción y siempre cierra la sesión
+
+    Uso:
+        with session_scope() as db:
+            db.add(...)
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def register_user(db, telegram_id, username=None, first_name=None):
+    """
+    Registrar usuario si no existe - retorna True si se creó
+    En SQLite/PostgreSQL es un solo INSERT ... ON CONFLICT DO NOTHING
+    (sin SELECT previo); otros motores usan SELECT + INSERT
+    """
+    values = dict(
+        telegram_id=telegram_id,
+        username=username,
+        first_name=first_name,
+        bitcoin_address="",
+        reputation_score=5.0,
+        total_deals=0,
+        total_volume=0
+    )
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+        stmt = insert(User).values(**values).on_conflict_do_nothing(index_elements=['telegram_id'])
+        return db.execute(stmt).rowcount == 1
+
+    if db.query(User.id).filter(User.telegram_id == telegram_id).first():
+        return False
+    db.add(User(**values))
+    return True
+
 def drop_all_tables():
     """
     FUNCIÓN PELIGROSA: Elimina todas las tablas
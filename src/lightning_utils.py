@@ -8,6 +8,7 @@ Uses REST API for simplicity and reliability
 """
 
 import os
+import re
 import json
 import base64
 import requests
@@ -24,6 +25,9 @@ LND_REST_HOST = os.getenv('LND_REST_HOST', 'localhost:8080')
 LND_TLS_CERT_PATH = os.getenv('LND_TLS_CERT_PATH', '~/.lnd/tls.cert')
 LND_MACAROON_PATH = os.getenv('LND_MACAROON_PATH', '~/.lnd/data/chain/bitcoin/testnet/readonly.macaroon')
 
+# BOLT11 format: network prefix (group 1), optional amount, bech32 data part
+LN_INVOICE_RE = re.compile(r'^ln(bcrt|bc|tb)\d*[munp]?1[qpzry9x8gf2tvdw0s3jn54khce6mua7l]{100,}$', re.IGNORECASE)
+
 class LNDClient:
     """Client for connecting to LND via REST API"""
     
@@ -183,11 +187,12 @@ def validate_lightning_invoice(invoice: str) -> Tuple[bool, Optional[Dict]]:
             return False, None
             
         # Basic format check
-        if not invoice.startswith(('lnbc', 'lntb', 'lnbcrt')):
+        invoice_match = LN_INVOICE_RE.match(invoice)
+        if not invoice_match:
             return False, None
 
         # Network validation - reject mainnet invoices (lnbc but not lnbcrt)
-        if invoice.startswith('lnbc') and not invoice.startswith('lnbcrt'):
+        if invoice_match.group(1).lower() == 'bc':
             return False, None
         
         client = LNDClient()
@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 
 LNPROXY_BASE_URL = "https://lnproxy.lnemail.net"
 
+# Shared client - keeps the lnproxy connection alive between wrap attempts
+_client = None
+
 class LNProxyClient:
     """Client for lnproxy.org invoice masking service"""
     
@@ -24,6 +27,10 @@ class LNProxyClient:
             'Content-Type': 'application/json'
         })
     
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+    
     def check_service_availability(self) -> bool:
         """Check if lnproxy service is available"""
         try:
@@ -98,6 +105,20 @@ class LNProxyClient:
 # HIGH-LEVEL FUNCTIONS FOR BOT INTEGRATION
 # =============================================================================
 
+def get_lnproxy_client() -> LNProxyClient:
+    """Return the shared lnproxy client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = LNProxyClient()
+    return _client
+
+def close_lnproxy_client():
+    """Close the shared lnproxy client (call on bot shutdown)"""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
 def wrap_invoice_for_privacy(original_invoice: str) -> Tuple[bool, Dict]:
     """
     Attempt to wrap invoice with lnproxy for privacy
@@ -108,7 +129,7 @@ def wrap_invoice_for_privacy(original_invoice: str) -> Tuple[bool, Dict]:
     - If failed: original_invoice, privacy_enabled=False, error_message
     """
     try:
-        client = LNProxyClient()
+        client = get_lnproxy_client()
         
         # Try to create wrapped invoice
         result = client.create_wrapped_invoice(original_invoice)
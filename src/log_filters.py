@@ -10,6 +10,7 @@ Part of Issue #30 Phase 1 implementation.
 """
 
 import re
+import time
 import logging
 from typing import Optional, Pattern, List
 
@@ -239,8 +240,6 @@ class RateLimitFilter(logging.Filter):
         Rate limit identical log messages.
         Returns True to allow the message, False to suppress it.
         """
-        import time
-
         current_time = time.time()
         message_key = f"{record.levelname}:{record.getMessage()}"
 
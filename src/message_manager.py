@@ -12,10 +12,19 @@ Issue #36: Centralized Message Management System
 import os
 import yaml
 import logging
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4096)
+def format_amount(amount: int) -> str:
+    """
+    Format amount with dots as thousand separators (Latin format)
+    Memoized: only a few distinct amounts exist (fixed offer sizes)
+    """
+    return f"{amount:,}".replace(",", ".")
+
 class MessageManager:
     """
     Centralized message manager that loads from messages.yaml
@@ -160,7 +169,7 @@ class MessageManager:
     
     def format_amount(self, amount: int) -> str:
         """Format amount with dots as thousand separators (Latin format)"""
-        return f"{amount:,}".replace(",", ".")
+        return format_amount(amount)
     
     def get_rating_stars(self, rating: float) -> str:
         """Convert numeric rating to stars"""